@@ -12,25 +12,97 @@ User Experience:
 
 import http.server
 import socketserver
-import webbrowser
 import subprocess
 import threading
 import os
 import sys
 import json
-import urllib.parse
+import gzip
+import re
+import signal
 from pathlib import Path
-import tempfile
-import time
 import socket
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+
+# Prefer orjson (much faster encode/decode) when installed, else the stdlib json module
+try:
+    import orjson
+
+    def _json_dumps(data):
+        return orjson.dumps(data)
+
+    _json_loads = orjson.loads
+except ImportError:
+    def _json_dumps(data):
+        return json.dumps(data).encode('utf-8')
+
+    _json_loads = json.loads
+
+# Fixed error responses, encoded once
+_ERR_INVALID_PATH = _json_dumps({'error': 'Invalid folder path'})
+_ERR_NOT_A_DIRECTORY = _json_dumps({'error': 'Path is not a directory'})
+_ERR_NO_CSV = _json_dumps({
+    'error': 'No CSV files found in this directory or its subfolders.',
+    'help': 'Please select a folder that contains CSV files directly or has subfolders with CSV files.'
+})
+_ERR_SCRIPT_MISSING = _json_dumps({'error': 'check_csv_charset.py not found'})
+_ERR_TIMEOUT = _json_dumps({'error': 'Analysis timed out (5 minutes)'})
+
+# Bounded pool for analysis subprocesses so concurrent requests can't explode thread count
+ANALYZE_TIMEOUT = 300  # seconds
+ANALYZE_WORKERS = (os.cpu_count() or 1) * 2
+EXECUTOR = ThreadPoolExecutor(max_workers=ANALYZE_WORKERS)
+# Every analyzer process holds a slot, including the streamed ones that run outside EXECUTOR
+ANALYZE_SLOTS = threading.BoundedSemaphore(ANALYZE_WORKERS)
+
+# Recent analyze responses keyed by request parameters + folder signature (LRU)
+RESULT_CACHE_SIZE = 32
+_RESULT_CACHE = OrderedDict()
+_RESULT_CACHE_LOCK = threading.Lock()
+
+# ANSI color/control sequences emitted by check_csv_charset.py
+_ANSI_RE = re.compile(rb'\x1B(?:[@-Z\\-_]|\[[0-?]*[ -/]*[@-~])')
+
+
+class ThreadedServer(socketserver.ThreadingMixIn, http.server.HTTPServer):
+    """HTTP server handling each request in its own thread"""
+    daemon_threads = True
+    allow_reuse_address = True
+    request_queue_size = 128
+
 
 class CharsetAnalyzerHandler(http.server.SimpleHTTPRequestHandler):
     """Custom HTTP handler for the charset analyzer web GUI"""
+
+    # HTTP/1.1 keeps the connection alive between the page load and API calls;
+    # every response must therefore carry an accurate Content-length
+    protocol_version = 'HTTP/1.1'
+
+    # Buffered wfile: headers and a small body go out in one write, and the
+    # server flushes it after every request
+    wbufsize = -1
+
+    # Reference to charset script (constant for the process lifetime)
+    charset_script = Path(__file__).parent / "check_csv_charset.py"
+    _script_str = str(charset_script)
+    _script_available = charset_script.exists()
+    _status_json = _json_dumps({
+        'script_available': _script_available,
+        'script_path': _script_str
+    })
+
+    def setup(self):
+        """Disable Nagle's algorithm so small responses are sent immediately"""
+        super().setup()
+        try:
+            self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        except OSError:
+            pass
     
-    def __init__(self, *args, **kwargs):
-        # Store reference to charset script
-        self.charset_script = Path(__file__).parent / "check_csv_charset.py"
-        super().__init__(*args, **kwargs)
+    def log_request(self, code='-', size='-'):
+        """Skip per-request access logging (errors are still logged via log_error)"""
+        pass
     
     def do_GET(self):
         """Handle GET requests"""
@@ -45,133 +117,260 @@ class CharsetAnalyzerHandler(http.server.SimpleHTTPRequestHandler):
         """Handle POST requests"""
         if self.path == '/api/analyze':
             self.handle_analyze()
+        elif self.path == '/api/analyze/stream':
+            self.handle_analyze_stream()
         else:
+            # The request body is left unread, so don't reuse the connection
+            self.close_connection = True
             self.send_error(404)
     
     def serve_main_page(self):
-        """Serve the main HTML interface"""
-        html_content = self.get_html_interface()
+        """Serve the main HTML interface (gzip-compressed when accepted)"""
+        if 'gzip' in self.headers.get('Accept-Encoding', ''):
+            body, length = _HTML_GZIP, _HTML_GZIP_LEN
+        else:
+            body, length = _HTML_BYTES, _HTML_LEN
         self.send_response(200)
-        self.send_header('Content-type', 'text/html')
-        self.send_header('Content-length', len(html_content.encode()))
-        self.end_headers()
-        self.wfile.write(html_content.encode())
+        self.send_header('Content-type', 'text/html; charset=utf-8')
+        self.send_header('Content-length', length)
+        if body is _HTML_GZIP:
+            self.send_header('Content-Encoding', 'gzip')
+        self.send_header('Vary', 'Accept-Encoding')
+        self.end_headers_with_body(body)
     
     def serve_status(self):
-        """Serve status information"""
-        status = {
-            'script_available': self.charset_script.exists(),
-            'script_path': str(self.charset_script)
-        }
-        
+        """Serve status information (computed once at startup)"""
         self.send_response(200)
-        self.send_header('Content-type', 'application/json')
-        self.end_headers()
-        self.wfile.write(json.dumps(status).encode())
+        self.send_header('Content-type', 'application/json; charset=utf-8')
+        self.send_header('Content-length', str(len(self._status_json)))
+        self.end_headers_with_body(self._status_json)
     
     def handle_analyze(self):
         """Handle analysis requests"""
         try:
-            # Get content length
-            content_length = int(self.headers['Content-Length'])
-            post_data = self.rfile.read(content_length)
-            
-            # Parse JSON data
-            data = json.loads(post_data.decode())
-            folder_path = data.get('folder_path', '')
-            mode = data.get('mode', 'analyze')
-            target_encoding = data.get('target_encoding', 'utf-8')
-            dry_run = data.get('dry_run', True)
-            fast_mode = data.get('fast_mode', False)
-            
-            # Validate folder path
-            if not folder_path or not os.path.exists(folder_path):
-                self.send_json_response({'error': 'Invalid folder path'}, 400)
-                return
-            
-            # Check if user provided direct CSV folder vs parent folder
-            folder_path_obj = Path(folder_path)
-            if not folder_path_obj.is_dir():
-                self.send_json_response({'error': 'Path is not a directory'}, 400)
+            prepared = self.prepare_analysis()
+            if prepared is None:
                 return
+            cmd, cache_key = prepared
             
-            # Auto-detect folder structure (but now we support both!)
-            csv_files_in_root = list(folder_path_obj.glob('*.csv')) + list(folder_path_obj.glob('*.CSV'))
-            subfolders = [d for d in folder_path_obj.iterdir() if d.is_dir()]
-            
-            # Check if we have CSV files at all
-            total_csv_in_subfolders = 0
-            for subfolder in subfolders:
-                subfolder_csv = list(subfolder.rglob('*.csv')) + list(subfolder.rglob('*.CSV'))
-                total_csv_in_subfolders += len(subfolder_csv)
-            
-            if not csv_files_in_root and total_csv_in_subfolders == 0:
-                self.send_json_response({
-                    'error': f'No CSV files found in this directory or its subfolders.',
-                    'help': 'Please select a folder that contains CSV files directly or has subfolders with CSV files.'
-                }, 400)
+            # Repeat requests on an unchanged folder are answered from the cache
+            cached = _cache_get(cache_key)
+            if cached is not None:
+                self.send_json_response(cached)
                 return
             
-            if not self.charset_script.exists():
-                self.send_json_response({'error': 'check_csv_charset.py not found'}, 500)
-                return
-            
-            # Build command
-            cmd = [sys.executable, str(self.charset_script), folder_path]
-            
-            if mode == 'convert':
-                cmd.extend(['--convert-to', target_encoding])
-                if dry_run:
-                    cmd.append('--dry-run')
-            
-            if fast_mode:
-                cmd.append('--fast')
-            
-            # Always add summary for cleaner output
-            cmd.append('--summary-only')
-            
             # Run analysis
             try:
-                result = subprocess.run(cmd, capture_output=True, text=True, timeout=300)
+                # _run_analysis times the analysis from its process start; the wait
+                # here only bounds the time spent queued for a slot
+                claim = threading.Lock()
+                future = EXECUTOR.submit(_run_analysis, cmd, claim=claim)
+                try:
+                    result = future.result(timeout=ANALYZE_TIMEOUT)
+                except FutureTimeoutError:
+                    future.cancel()
+                    if claim.acquire(blocking=False):
+                        # Still queued: it will never start
+                        raise
+                    # Started meanwhile, with its own timeout
+                    result = future.result()
+                returncode, stdout, stderr = result
                 
                 # Clean ANSI codes from output
-                clean_output = self.clean_ansi_codes(result.stdout)
+                clean_output = self.clean_ansi_codes(stdout)
                 
                 response = {
-                    'success': result.returncode == 0,
+                    'success': returncode == 0,
                     'output': clean_output,
-                    'error_output': result.stderr if result.stderr else None,
+                    'error_output': stderr.decode('utf-8', errors='replace') if stderr else None,
                     'command': ' '.join(cmd[1:])  # Don't include python path
                 }
                 
+                if response['success']:
+                    _cache_put(cache_key, response)
+                
                 self.send_json_response(response)
                 
-            except subprocess.TimeoutExpired:
-                self.send_json_response({'error': 'Analysis timed out (5 minutes)'}, 500)
+            except (subprocess.TimeoutExpired, FutureTimeoutError):
+                self.send_json_response(_ERR_TIMEOUT, 500)
             except Exception as e:
                 self.send_json_response({'error': f'Analysis failed: {str(e)}'}, 500)
                 
         except Exception as e:
             self.send_json_response({'error': f'Request processing failed: {str(e)}'}, 500)
     
+    def handle_analyze_stream(self):
+        """Handle analysis requests, streaming output lines as Server-Sent Events"""
+        try:
+            prepared = self.prepare_analysis()
+        except Exception as e:
+            self.send_json_response({'error': f'Request processing failed: {str(e)}'}, 500)
+            return
+        if prepared is None:
+            return
+        cmd, cache_key = prepared
+        cached = _cache_get(cache_key)
+        
+        # No Content-length for a stream: the end of the response is the closed connection
+        self.send_response(200)
+        self.send_header('Content-type', 'text/event-stream; charset=utf-8')
+        self.send_header('Cache-Control', 'no-cache')
+        self.send_header('Connection', 'close')
+        self.end_headers()
+        self.close_connection = True
+        
+        try:
+            if cached is not None:
+                # Same per-line treatment as a live run: drop the CR of a CRLF ending,
+                # then keep the final state of '\r'-redrawn progress lines
+                for line in cached['output'].split('\n'):
+                    self.send_event(line.rstrip('\r').rsplit('\r', 1)[-1])
+                self.send_event(_json_dumps({'success': True, 'command': cached['command']}), 'done')
+                return
+            
+            # Wait for a free slot rather than spawning past the pool's bound
+            if not ANALYZE_SLOTS.acquire(timeout=ANALYZE_TIMEOUT):
+                self.send_event(_json_dumps({'success': False, 'error': 'Analysis timed out (5 minutes)'}), 'done')
+                return
+            try:
+                proc = _start_analysis(cmd, stderr=subprocess.STDOUT, unbuffered=True)
+                timed_out = threading.Event()
+            
+                def on_timeout():
+                    timed_out.set()
+                    _kill_process_group(proc)
+            
+                timer = threading.Timer(ANALYZE_TIMEOUT, on_timeout)
+                timer.daemon = True
+                timer.start()
+                lines = [] if cache_key is not None else None
+                try:
+                    for raw in proc.stdout:
+                        # Keep only the final state of '\r'-redrawn progress lines
+                        line = self.clean_ansi_codes(raw.rstrip(b'\r\n').rsplit(b'\r', 1)[-1])
+                        if lines is not None:
+                            lines.append(line)
+                        self.send_event(line)
+                    returncode = proc.wait()
+                except OSError:
+                    # Browser went away: stop the analysis instead of letting it run on
+                    _kill_process_group(proc)
+                    proc.wait()
+                    raise
+                finally:
+                    timer.cancel()
+                    proc.stdout.close()
+            
+                done = {'success': returncode == 0 and not timed_out.is_set(),
+                        'command': ' '.join(cmd[1:])}
+                if timed_out.is_set():
+                    done['error'] = 'Analysis timed out (5 minutes)'
+                elif done['success'] and lines is not None:
+                    _cache_put(cache_key, {'success': True, 'output': '\n'.join(lines),
+                                           'error_output': None, 'command': done['command']})
+                self.send_event(_json_dumps(done), 'done')
+            finally:
+                ANALYZE_SLOTS.release()
+        
+        except OSError:
+            pass
+        except Exception as e:
+            self.send_event(_json_dumps({'success': False, 'error': f'Analysis failed: {str(e)}'}), 'done')
+    
+    def prepare_analysis(self):
+        """
+        Parse and validate an analysis request body.
+        Returns (cmd, cache_key), or None if an error response was already sent.
+        cache_key is None for requests whose results must not be cached.
+        """
+        # Get content length
+        content_length = int(self.headers['Content-Length'])
+        
+        # Parse JSON data (both json and orjson accept UTF-8 bytes directly)
+        data = _json_loads(self.rfile.read(content_length))
+        folder_path = data.get('folder_path', '')
+        mode = data.get('mode', 'analyze')
+        target_encoding = data.get('target_encoding', 'utf-8')
+        dry_run = data.get('dry_run', True)
+        fast_mode = data.get('fast_mode', False)
+        
+        # Validate folder path (resolve once; fails if it does not exist)
+        try:
+            if not folder_path:
+                raise ValueError(folder_path)
+            folder_path_obj = Path(folder_path).resolve(strict=True)
+        except (OSError, ValueError, RuntimeError):
+            self.send_json_response(_ERR_INVALID_PATH, 400)
+            return None
+        
+        if not folder_path_obj.is_dir():
+            self.send_json_response(_ERR_NOT_A_DIRECTORY, 400)
+            return None
+        
+        # Check if we have CSV files at all (directly or in any subfolder)
+        if not _has_any_csv(folder_path_obj):
+            self.send_json_response(_ERR_NO_CSV, 400)
+            return None
+        
+        if not self._script_available:
+            self.send_json_response(_ERR_SCRIPT_MISSING, 500)
+            return None
+        
+        # Real conversions modify files, so they are never served from the cache
+        cache_key = None
+        if not (mode == 'convert' and not dry_run):
+            cache_key = (folder_path, mode, target_encoding, dry_run, fast_mode,
+                         _folder_signature(folder_path_obj))
+        
+        # Build command
+        cmd = [sys.executable, self._script_str, folder_path]
+        
+        if mode == 'convert':
+            cmd += ('--convert-to', target_encoding)
+            if dry_run:
+                cmd.append('--dry-run')
+        
+        if fast_mode:
+            cmd.append('--fast')
+        
+        # Always add summary for cleaner output
+        cmd.append('--summary-only')
+        
+        return cmd, cache_key
+    
+    def send_event(self, data, event=None):
+        """Write one Server-Sent Events frame (data is a single line, str or UTF-8 bytes)"""
+        if isinstance(data, str):
+            data = data.encode('utf-8')
+        prefix = b'event: ' + event.encode('ascii') + b'\ndata: ' if event else b'data: '
+        self.wfile.write(prefix + data + b'\n\n')
+        self.wfile.flush()  # each event must reach the browser as it happens
+    
     def send_json_response(self, data, status_code=200):
-        """Send JSON response"""
-        response_data = json.dumps(data).encode()
+        """Send JSON response (data may be a dict or pre-encoded JSON bytes)"""
+        response_data = data if isinstance(data, bytes) else _json_dumps(data)
         self.send_response(status_code)
-        self.send_header('Content-type', 'application/json')
-        self.send_header('Content-length', len(response_data))
-        self.end_headers()
-        self.wfile.write(response_data)
+        self.send_header('Content-type', 'application/json; charset=utf-8')
+        self.send_header('Content-length', str(len(response_data)))
+        self.end_headers_with_body(response_data)
     
-    def clean_ansi_codes(self, text):
-        """Remove ANSI color codes from text"""
-        import re
-        ansi_escape = re.compile(r'\x1B(?:[@-Z\\-_]|\[[0-?]*[ -/]*[@-~])')
-        return ansi_escape.sub('', text)
+    def end_headers_with_body(self, body):
+        """Finish the headers and send them together with the body"""
+        # Both land in the buffered wfile, so a small response is one syscall/packet
+        self.end_headers()
+        self.wfile.write(body)
+        self.wfile.flush()
     
-    def get_html_interface(self):
-        """Generate the HTML interface"""
-        return '''<!DOCTYPE html>
+    def clean_ansi_codes(self, raw):
+        """Remove ANSI color codes from raw output bytes and decode to text"""
+        # Plain output (no ESC byte) skips the regex; the membership test is a memchr
+        if b'\x1b' in raw:
+            raw = _ANSI_RE.sub(b'', raw)
+        return raw.decode('utf-8', errors='replace')
+
+
+# The HTML interface, encoded once at import and served as-is for every GET /
+HTML_INTERFACE = '''<!DOCTYPE html>
 <html lang="en">
 <head>
     <meta charset="UTF-8">
@@ -852,17 +1051,30 @@ class CharsetAnalyzerHandler(http.server.SimpleHTTPRequestHandler):
                 showStatus('Running analysis...', 'info');
                 showProgress(true);
                 
-                const response = await fetch('/api/analyze', {
+                const response = await fetch('/api/analyze/stream', {
                     method: 'POST',
                     headers: {
                         'Content-Type': 'application/json',
                     },
                     body: JSON.stringify(analysisData)
                 });
-                
-                const result = await response.json();
-                
-                if (result.success) {
+
+                // Output is streamed line by line; validation errors still come back as JSON
+                const contentType = response.headers.get('Content-Type') || '';
+                const result = contentType.startsWith('text/event-stream')
+                    ? await readAnalysisStream(response)
+                    : await response.json();
+
+                if (result.streamed) {
+                    if (result.success) {
+                        showStatus('Analysis completed successfully!', 'success');
+                    } else {
+                        showStatus('Analysis failed. See output for details.', 'error');
+                        if (result.error) {
+                            appendOutput(result.error);
+                        }
+                    }
+                } else if (result.success) {
                     showStatus('Analysis completed successfully!', 'success');
                     showOutput(result.output);
                 } else {
@@ -917,6 +1129,52 @@ class CharsetAnalyzerHandler(http.server.SimpleHTTPRequestHandler):
             }
         }
         
+        function appendOutput(line) {
+            output.textContent += line + '\\n';
+            output.classList.add('show');
+            output.scrollTop = output.scrollHeight;
+        }
+
+        // Read Server-Sent Events from /api/analyze/stream until the final 'done' event
+        async function readAnalysisStream(response) {
+            const reader = response.body.getReader();
+            const decoder = new TextDecoder();
+            let buffer = '';
+            let result = { streamed: true, success: false, error: 'Connection closed before the analysis finished' };
+
+            output.textContent = '';
+            while (true) {
+                const { value, done } = await reader.read();
+                if (done) {
+                    break;
+                }
+                buffer += decoder.decode(value, { stream: true });
+
+                let end;
+                while ((end = buffer.indexOf('\\n\\n')) !== -1) {
+                    const frame = buffer.slice(0, end);
+                    buffer = buffer.slice(end + 2);
+
+                    let event = 'message';
+                    let data = '';
+                    for (const line of frame.split('\\n')) {
+                        if (line.startsWith('event: ')) {
+                            event = line.slice(7);
+                        } else if (line.startsWith('data: ')) {
+                            data = line.slice(6);
+                        }
+                    }
+
+                    if (event === 'done') {
+                        result = Object.assign(JSON.parse(data), { streamed: true });
+                    } else {
+                        appendOutput(data);
+                    }
+                }
+            }
+            return result;
+        }
+
         function showOutput(text) {
             output.textContent = text;
             output.classList.add('show');
@@ -926,28 +1184,130 @@ class CharsetAnalyzerHandler(http.server.SimpleHTTPRequestHandler):
         // Initialize
         updateModeOptions();
         
-        // Check if charset script is available
-        fetch('/api/status')
-            .then(response => response.json())
-            .then(data => {
-                if (!data.script_available) {
-                    showStatus('Warning: check_csv_charset.py not found in the same directory!', 'error');
-                }
-            })
-            .catch(error => {
-                console.error('Status check failed:', error);
-            });
+        // Check if charset script is available (status is embedded by the server, no extra request)
+        const serverStatus = /*STATUS_JSON*/null;
+        if (serverStatus && !serverStatus.script_available) {
+            showStatus('Warning: check_csv_charset.py not found in the same directory!', 'error');
+        }
     </script>
 </body>
 </html>'''
 
-def find_free_port():
-    """Find a free port to run the server on"""
-    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
-        s.bind(('', 0))
-        s.listen(1)
-        port = s.getsockname()[1]
-    return port
+def _minify_html(html):
+    """Strip indentation and blank lines (the page has no whitespace-sensitive blocks)"""
+    return '\n'.join(line.strip() for line in html.splitlines() if line.strip())
+
+# Same payload as /api/status; '</' is escaped so a path can't close the <script> tag
+_STATUS_SCRIPT_JSON = CharsetAnalyzerHandler._status_json.decode('utf-8').replace('</', '<\\/')
+
+_HTML_BYTES = _minify_html(
+    HTML_INTERFACE.replace('/*STATUS_JSON*/null', _STATUS_SCRIPT_JSON)
+).encode('utf-8')
+_HTML_LEN = str(len(_HTML_BYTES))
+_HTML_GZIP = gzip.compress(_HTML_BYTES, compresslevel=9)
+_HTML_GZIP_LEN = str(len(_HTML_GZIP))
+
+def _start_analysis(cmd, stderr=subprocess.PIPE, unbuffered=False):
+    """Start the analyzer with piped stdout in its own process group"""
+    env = dict(os.environ, PYTHONIOENCODING='utf-8')
+    if unbuffered:
+        # Make the child flush every line so output can be streamed as it happens
+        env['PYTHONUNBUFFERED'] = '1'
+    # Run the child in its own process group so a timeout can kill any grandchildren too
+    if os.name == 'nt':
+        group_kwargs = {'creationflags': subprocess.CREATE_NEW_PROCESS_GROUP}
+    else:
+        group_kwargs = {'start_new_session': True}
+    return subprocess.Popen(
+        cmd,
+        stdout=subprocess.PIPE,
+        stderr=stderr,
+        bufsize=-1,
+        env=env,
+        **group_kwargs
+    )
+
+def _run_analysis(cmd, timeout=ANALYZE_TIMEOUT, claim=None):
+    """
+    Run the analyzer and return (returncode, stdout_bytes, stderr_bytes).
+    The timeout starts once a slot is free. If claim (a Lock) is already held when
+    the slot comes, the request gave up waiting: return None without starting.
+    """
+    with ANALYZE_SLOTS:
+        if claim is not None and not claim.acquire(blocking=False):
+            return None
+        proc = _start_analysis(cmd)
+        try:
+            stdout, stderr = proc.communicate(timeout=timeout)
+        except subprocess.TimeoutExpired:
+            _kill_process_group(proc)
+            proc.communicate()
+            raise
+    return proc.returncode, stdout, stderr
+
+def _kill_process_group(proc, grace=1.0):
+    """Terminate the child's process group, escalating to SIGKILL after a grace period"""
+    if os.name == 'nt':
+        proc.kill()
+        return
+    try:
+        os.killpg(proc.pid, signal.SIGTERM)
+        try:
+            proc.wait(timeout=grace)
+        except subprocess.TimeoutExpired:
+            pass
+        os.killpg(proc.pid, signal.SIGKILL)
+    except ProcessLookupError:
+        pass
+
+def _cache_get(key):
+    """Return a cached analyze response, or None"""
+    if key is None:
+        return None
+    with _RESULT_CACHE_LOCK:
+        cached = _RESULT_CACHE.get(key)
+        if cached is not None:
+            _RESULT_CACHE.move_to_end(key)
+        return cached
+
+def _cache_put(key, response):
+    """Store an analyze response, evicting the least recently used entries"""
+    if key is None:
+        return
+    with _RESULT_CACHE_LOCK:
+        _RESULT_CACHE[key] = response
+        _RESULT_CACHE.move_to_end(key)
+        while len(_RESULT_CACHE) > RESULT_CACHE_SIZE:
+            _RESULT_CACHE.popitem(last=False)
+
+def _folder_signature(root):
+    """Cheap fingerprint of all CSV files under root (name, mtime, size)"""
+    entries = []
+    for dirpath, _dirnames, filenames in os.walk(root):
+        for name in filenames:
+            if name.lower().endswith('.csv'):
+                try:
+                    st = os.stat(os.path.join(dirpath, name))
+                except OSError:
+                    continue
+                entries.append((dirpath, name, st.st_mtime_ns, st.st_size))
+    return hash(frozenset(entries))
+
+def _has_any_csv(root):
+    """Return True as soon as a CSV file is found anywhere under root"""
+    # Files are checked while the directory is being read, so the first hit stops all I/O
+    pending = [root]
+    while pending:
+        try:
+            with os.scandir(pending.pop()) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        pending.append(entry.path)
+                    elif entry.name.lower().endswith('.csv') and entry.is_file():
+                        return True
+        except OSError:
+            continue
+    return False
 
 def main():
     """Main function to start the web server"""
@@ -962,17 +1322,17 @@ def main():
         input("Press Enter to exit...")
         return
     
-    # Find a free port
-    port = find_free_port()
-    
     print(f"🚀 Starting CSV Charset Analyzer...")
     print(f"📁 Script location: {script_dir}")
-    print(f"🌐 Starting web server on port {port}...")
     
     try:
-        # Start server
-        with socketserver.TCPServer(("", port), CharsetAnalyzerHandler) as httpd:
-            server_url = f"http://localhost:{port}"
+        # Start server on a free port chosen by the OS (port 0), then read it back.
+        # Bound to loopback only: the GUI runs commands on local folders, so it is
+        # not reachable from other machines on the network
+        with ThreadedServer(("127.0.0.1", 0), CharsetAnalyzerHandler) as httpd:
+            port = httpd.server_address[1]
+            server_url = f"http://127.0.0.1:{port}"
+            print(f"🌐 Web server listening on port {port} (this computer only)")
             
             print(f"✅ Server started successfully!")
             print(f"🔗 Opening browser: {server_url}")
@@ -988,16 +1348,17 @@ def main():
             
             # Open browser automatically
             def open_browser():
-                time.sleep(1)  # Give server time to start
+                # Imported here: webbrowser pulls in several modules not needed to start serving
+                import webbrowser
                 try:
                     webbrowser.open(server_url)
                 except Exception as e:
                     print(f"Could not auto-open browser: {e}")
                     print(f"Please manually open: {server_url}")
             
-            browser_thread = threading.Thread(target=open_browser)
-            browser_thread.daemon = True
-            browser_thread.start()
+            # The socket is already listening, so the browser's request just queues
+            # until serve_forever picks it up
+            threading.Thread(target=open_browser, daemon=True).start()
             
             # Serve forever
             httpd.serve_forever()
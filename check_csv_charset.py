@@ -26,14 +26,50 @@ import os
 import sys
 import argparse
 import shutil
+import tempfile
+import hashlib
+import json
+import codecs
+import itertools
+import re
+from functools import lru_cache
+from operator import itemgetter
 from pathlib import Path
-from typing import Dict, Optional, Tuple, List
-from collections import defaultdict
+from typing import Dict, Iterator, Optional, Tuple, List
+from collections import Counter, defaultdict, OrderedDict
 import time
-from concurrent.futures import ProcessPoolExecutor, as_completed
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 
 # ---------- Config ----------
-DEFAULT_JOBS = max(1, (os.cpu_count() or 1) // 2)  # default: half the cores
+def _physical_cpu_count() -> int:
+    """
+    Physical cores: SMT siblings don't speed up CPU-bound chardet. Honors the
+    CHARSET_SCAN_CPU_COUNT override, then psutil if installed, and otherwise
+    assumes two logical CPUs per core (half the cores).
+    """
+    override = os.environ.get('CHARSET_SCAN_CPU_COUNT')
+    if override:
+        try:
+            return max(1, int(override))
+        except ValueError:
+            pass
+    try:
+        import psutil
+        physical = psutil.cpu_count(logical=False)
+    except ImportError:
+        physical = None
+    return physical or max(1, (os.cpu_count() or 1) // 2)
+
+PHYSICAL_CPUS = _physical_cpu_count()
+# default: one worker per physical core, up to 8 (page cache/disk queue saturate beyond)
+DEFAULT_JOBS = max(1, min(PHYSICAL_CPUS, 8))
+# BOM/ASCII/UTF-8/UTF-16 are decided within the first few KB; only unsure files
+# escalate to the larger second pass (8 KiB x 8 = 64 KiB)
+DEFAULT_SAMPLE_SIZE = 8192
+FAST_SAMPLE_SIZE = 4096  # --fast: single pass over a smaller head
+SECOND_PASS_FACTOR = 8
+CONVERT_JOBS = min(8, os.cpu_count() or 1)  # parallel file conversions per folder
 # ----------------------------
 
 # Color codes for terminal output
@@ -54,16 +90,97 @@ def install_chardet_message():
     print(f"{Colors.YELLOW}Install one of these:{Colors.NC}")
     print(f"  pip3 install cchardet   # fastest (optional)")
     print(f"  pip3 install chardet    # default")
+    print(f"  pip3 install charset-normalizer  # slower fallback")
     sys.exit(1)
 
-# Try fast detector first, fallback to chardet
+# Try fast detector first, fallback to chardet, then charset-normalizer's
+# chardet-compatible detect() (often already present as a requests dependency)
 try:
     import cchardet as chardet
 except ImportError:
     try:
         import chardet
     except ImportError:
-        install_chardet_message()
+        try:
+            import charset_normalizer as chardet
+        except ImportError:
+            install_chardet_message()
+
+# cchardet is a C extension: per-file detection is then cheap enough that file I/O
+# dominates, so threads beat worker processes (no spawn, no pickling)
+_DETECTOR_IS_C = chardet.__name__ == 'cchardet'
+
+# Per-process memo of detector results keyed by the exact sample bytes.
+# Duplicate CSVs (snapshots, bak copies) then cost a hash instead of a chardet run.
+_DETECT_CACHE_SIZE = 4096
+_DETECT_CACHE: "OrderedDict[Tuple[int, bytes], dict]" = OrderedDict()
+_DETECT_CACHE_LOCK = threading.Lock()  # the thread-pool path shares one memo
+
+def _cached_detect(data: bytes) -> dict:
+    """chardet.detect with a bounded LRU memo; each worker process keeps its own."""
+    key = (len(data), hashlib.blake2b(data, digest_size=16).digest())
+    with _DETECT_CACHE_LOCK:
+        res = _DETECT_CACHE.get(key)
+        if res is not None:
+            _DETECT_CACHE.move_to_end(key)
+            return res
+    res = chardet.detect(data)
+    with _DETECT_CACHE_LOCK:
+        _DETECT_CACHE[key] = res
+        if len(_DETECT_CACHE) > _DETECT_CACHE_SIZE:
+            _DETECT_CACHE.popitem(last=False)
+    return res
+
+def select_detector(name: str = 'auto') -> str:
+    """
+    Rebind the module-wide detector ('auto' keeps whichever import succeeded).
+    Raises ImportError if the requested package isn't installed.
+    """
+    global chardet, _DETECTOR_IS_C
+    if name != 'auto' and name != chardet.__name__:
+        chardet = __import__(name)
+        _DETECTOR_IS_C = name == 'cchardet'
+        # Memoized results came from the other detector
+        with _DETECT_CACHE_LOCK:
+            _DETECT_CACHE.clear()
+    return chardet.__name__
+
+
+
+# Display color per encoding name (lower-cased); other iso*/windows* names are yellow
+_ENC_COLOR = {
+    'utf-8': Colors.GREEN,
+    'utf8': Colors.GREEN,
+    'utf-8-sig': Colors.GREEN,
+    'ascii': Colors.BLUE,
+    'binary': Colors.RED,
+    'utf-16-le': Colors.RED,
+    'utf-16-be': Colors.RED,
+    'utf-32-le': Colors.RED,
+    'utf-32-be': Colors.RED,
+}
+
+@lru_cache(maxsize=None)
+def encoding_color(encoding: Optional[str]) -> str:
+    """Terminal color used to print an encoding name."""
+    if not encoding:
+        return Colors.MAGENTA
+    enc = encoding.lower()
+    color = _ENC_COLOR.get(enc)
+    if color:
+        return color
+    if 'iso' in enc or 'windows' in enc:
+        return Colors.YELLOW
+    return Colors.MAGENTA
+
+def disable_colors() -> None:
+    """Blank every color code, for piped output, NO_COLOR or --no-color."""
+    for name, value in list(vars(Colors).items()):
+        if isinstance(value, str) and value.startswith('\033'):
+            setattr(Colors, name, '')
+    for enc in _ENC_COLOR:
+        _ENC_COLOR[enc] = ''
+    encoding_color.cache_clear()
 
 
 def format_time(seconds: float) -> str:
@@ -84,7 +201,33 @@ class ProgressBar:
         self.width = width
         self.title = title
         self.current = 0
-        self.start_time = time.time()
+        self.start_time = time.monotonic()
+        self.last_draw = 0.0
+        # Pre-built pieces: each redraw slices the bars and fills one template
+        self._full = '█' * width
+        self._empty = '░' * width
+        self._fmt = (
+            f'\r{Colors.CYAN}{title.replace("%", "%%")}:{Colors.NC} '
+            f'[{Colors.GREEN}%s{Colors.NC}] '
+            f'{Colors.YELLOW}%d/%d{Colors.NC} '
+            f'(%.1f%%) {Colors.DIM}%s{Colors.NC} '
+            f'{Colors.DIM}%s{Colors.NC} '
+            f'{Colors.BLUE}%s{Colors.NC}'
+        )
+        # Byte versions of the same pieces for writing straight to the binary stdout,
+        # skipping TextIOWrapper's per-call encode; None when stdout has no buffer
+        self._out = getattr(sys.stdout, 'buffer', None)
+        self._encoding = getattr(sys.stdout, 'encoding', None) or 'utf-8'
+        full_unit = '█'.encode(self._encoding, 'replace')
+        empty_unit = '░'.encode(self._encoding, 'replace')
+        self._full_b = full_unit * width
+        self._empty_b = empty_unit * width
+        self._full_unit_len = len(full_unit)
+        self._empty_unit_len = len(empty_unit)
+        self._fmt_b = self._fmt.encode(self._encoding, 'replace')
+
+    # Minimum seconds between redraws; the final update always draws
+    REDRAW_INTERVAL = 0.05
 
     def update(self, current: int, item_name: str = ""):
         """Update progress bar"""
@@ -93,12 +236,18 @@ class ProgressBar:
         if self.total == 0:
             return
 
+        # Throttle: every draw is a flushed terminal write, so skip ones nobody can see
+        now = time.monotonic()
+        if current != self.total and now - self.last_draw < self.REDRAW_INTERVAL:
+            return
+        self.last_draw = now
+
         # Calculate progress
         progress = self.current / self.total
         filled = int(self.width * progress)
 
         # Calculate time
-        elapsed = time.time() - self.start_time
+        elapsed = now - self.start_time
         if self.current > 0:
             avg_time = elapsed / self.current
             remaining = avg_time * (self.total - self.current)
@@ -108,25 +257,29 @@ class ProgressBar:
 
         total_time_str = f"Elapsed: {format_time(elapsed)}"
 
-        # Create progress bar
-        bar = '█' * filled + '░' * (self.width - filled)
-
         # Truncate item name if too long
         max_item_len = 40
         if len(item_name) > max_item_len:
             item_name = item_name[:max_item_len-3] + "..."
 
         # Print progress bar
-        print(
-            f'\r{Colors.CYAN}{self.title}:{Colors.NC} '
-            f'[{Colors.GREEN}{bar}{Colors.NC}] '
-            f'{Colors.YELLOW}{self.current}/{self.total}{Colors.NC} '
-            f'({progress*100:.1f}%) {Colors.DIM}{time_str}{Colors.NC} '
-            f'{Colors.DIM}{total_time_str}{Colors.NC} '
-            f'{Colors.BLUE}{item_name}{Colors.NC}',
-            end='',
-            flush=True
-        )
+        if self._out is not None:
+            bar_b = (self._full_b[:filled * self._full_unit_len]
+                     + self._empty_b[filled * self._empty_unit_len:])
+            line = self._fmt_b % (bar_b, self.current, self.total, progress * 100,
+                                  time_str.encode('ascii'), total_time_str.encode('ascii'),
+                                  item_name.encode(self._encoding, 'replace'))
+            sys.stdout.flush()  # keep ordering with text already queued on the wrapper
+            self._out.write(line)
+            self._out.flush()
+        else:
+            bar = self._full[:filled] + self._empty[filled:]
+            print(
+                self._fmt % (bar, self.current, self.total, progress * 100,
+                             time_str, total_time_str, item_name),
+                end='',
+                flush=True
+            )
 
         if self.current == self.total:
             print()  # New line when complete
@@ -152,65 +305,181 @@ def _detect_bom(sample: bytes) -> Optional[str]:
         return 'utf-16-be'
     return None
 
-def _guess_utf16_no_bom(sample: bytes) -> Optional[str]:
-    """Heuristic for UTF-16 without BOM: many NULs on even or odd indices."""
-    if len(sample) < 4:
+# Byte values 0x00-0x7F, deleted by bytes.translate to leave only the high (non-ASCII) bytes
+_ASCII_BYTES = bytes(range(0x80))
+
+# A UTF-7 shift: '+' then a run of 3+ base64 characters (not starting with '+')
+# containing an uppercase letter; a superset of what chardet accepts as UTF-7
+_UTF7_SHIFT = re.compile(rb'\+(?=[A-Za-z0-9/][A-Za-z0-9+/]{2})[a-z0-9+/]*[A-Z]').search
+
+def _classify_sample(sample: bytes) -> dict:
+    """
+    Gather every heuristic statistic from a sample in one go: BOM, size,
+    ASCII count, NUL count and even/odd NUL split. Each figure is a single
+    C-level bytes operation, so callers never re-walk the buffer per check.
+    """
+    size = len(sample)
+    if sample.isascii():
+        ascii_cnt = size
+    else:
+        ascii_cnt = size - len(sample.translate(None, _ASCII_BYTES))
+    nul_cnt = sample.count(0)
+    even_nul = sample[0::2].count(0) if nul_cnt else 0
+    return {
+        'bom': _detect_bom(sample),
+        'size': size,
+        'ascii': ascii_cnt,
+        'nul': nul_cnt,
+        'even_nul': even_nul,
+        'odd_nul': nul_cnt - even_nul,
+        # 7-bit encodings that are not ASCII text: ESC starts ISO-2022 shift
+        # sequences, '~{' HZ-GB-2312 ones and (in all-7-bit data) '+' UTF-7 ones
+        'esc': (b'\x1b' in sample or b'~{' in sample
+                or (ascii_cnt == size and _UTF7_SHIFT(sample) is not None)),
+    }
+
+def _is_plain_ascii(stats: dict) -> bool:
+    """
+    True when the sample is 7-bit text that chardet would only report as ascii:
+    no NUL (UTF-16/32) and no ISO-2022, HZ or UTF-7 shift sequence.
+    """
+    return stats['size'] > 0 and stats['ascii'] == stats['size'] and not stats['nul'] and not stats['esc']
+
+def _binary_verdict(stats: dict) -> Optional[Tuple[str, float]]:
+    """('binary', 100.0) when the NUL ratio alone settles it, else None."""
+    if not stats['size'] or stats['nul'] / stats['size'] < 0.30:
         return None
-    even_zeros = sum(1 for i in range(0, len(sample), 2) if sample[i] == 0)
-    odd_zeros  = sum(1 for i in range(1, len(sample), 2) if sample[i] == 0)
-    half = max(1, len(sample) // 2)
-    even_ratio = even_zeros / half
-    odd_ratio  = odd_zeros / half
-    if odd_ratio > 0.40 and even_ratio < 0.20:
-        return 'utf-16-le'
-    if even_ratio > 0.40 and odd_ratio < 0.20:
-        return 'utf-16-be'
-    return None
+    heuristic = _apply_heuristics(stats)
+    return heuristic if heuristic and heuristic[0] == 'binary' else None
 
-def _is_mostly_ascii(sample: bytes, thresh: float = 0.98) -> bool:
-    if not sample:
+def _is_valid_utf8(sample: bytes, partial: bool = False) -> bool:
+    """
+    Strict UTF-8 check. With partial=True the sample is a prefix of a longer
+    file, so a multi-byte sequence cut at the sample end is tolerated.
+    """
+    try:
+        codecs.getincrementaldecoder('utf-8')().decode(sample, final=not partial)
+    except UnicodeDecodeError:
         return False
-    ascii_bytes = sum(1 for b in sample if b < 0x80)
-    return (ascii_bytes / len(sample)) >= thresh
+    return True
+
+def _apply_heuristics(stats: dict) -> Optional[Tuple[str, float]]:
+    """UTF-16 no-BOM, mostly-ASCII and binary-like checks on precomputed stats."""
+    size = stats['size']
+    if not size:
+        return None
+    if size >= 4:
+        half = max(1, size // 2)
+        even_ratio = stats['even_nul'] / half
+        odd_ratio = stats['odd_nul'] / half
+        if odd_ratio > 0.40 and even_ratio < 0.20:
+            return 'utf-16-le', 95.0
+        if even_ratio > 0.40 and odd_ratio < 0.20:
+            return 'utf-16-be', 95.0
+    if stats['ascii'] / size >= 0.98:
+        return 'ascii', 99.0
+    if stats['nul'] / size >= 0.30:
+        return 'binary', 100.0
+    return None
 
-def _is_binary_like(sample: bytes, nul_thresh: float = 0.30) -> bool:
-    """Rough check for non-text files: lots of NUL bytes."""
-    if not sample:
-        return False
-    nul_ratio = sample.count(0) / len(sample)
-    return nul_ratio >= nul_thresh
+
+# O_BINARY keeps Windows from translating line endings on raw descriptors
+_OPEN_FLAGS = os.O_RDONLY | getattr(os, 'O_BINARY', 0)
+# Linux: don't dirty inode atime for every sampled file. Only the file's owner (or
+# CAP_FOWNER) may ask, so the first EPERM switches it off for the process.
+_O_NOATIME = getattr(os, 'O_NOATIME', 0)
+
+def _open_for_sampling(file_path) -> int:
+    """os.open for reading, with O_NOATIME where permitted."""
+    global _O_NOATIME
+    if _O_NOATIME:
+        try:
+            return os.open(file_path, _OPEN_FLAGS | _O_NOATIME)
+        except PermissionError:
+            _O_NOATIME = 0
+    return os.open(file_path, _OPEN_FLAGS)
+
+if hasattr(os, 'pread'):
+    def _pread(fd: int, size: int, offset: int) -> bytes:
+        """Positional read without moving the file offset."""
+        return os.pread(fd, size, offset)
+else:
+    def _pread(fd: int, size: int, offset: int) -> bytes:
+        """Seek + read fallback for platforms without os.pread (Windows)."""
+        os.lseek(fd, offset, os.SEEK_SET)
+        return os.read(fd, size)
+
+if hasattr(os, 'posix_fadvise'):
+    def _no_readahead(fd: int) -> None:
+        """
+        Detection reads a few exact windows (head, tail, second pass) of files larger
+        than the sample; kernel readahead past them is wasted disk I/O on cold caches.
+        """
+        try:
+            os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_RANDOM)
+        except OSError:
+            pass
+else:
+    def _no_readahead(fd: int) -> None:
+        pass
 
 
 def detect_encoding(file_path: Path,
-                    sample_size: int = 65536,
+                    sample_size: int = DEFAULT_SAMPLE_SIZE,
                     do_second_pass: bool = True,
-                    second_pass_factor: int = 4,
-                    min_confidence_first_pass: float = 0.70) -> Tuple[str, float]:
+                    second_pass_factor: int = SECOND_PASS_FACTOR,
+                    min_confidence_first_pass: float = 0.70,
+                    file_size: Optional[int] = None) -> Tuple[str, float]:
     """
     Detect the character encoding of a file with minimal I/O (fully offline).
+    Pass file_size when the caller has already stat'ed the file to skip another stat.
     Order:
-      1) BOM check
+      1) BOM check, pure-ASCII and valid-UTF-8 shortcuts
       2) chardet/cchardet on head
-      3) chardet on head+tail if low confidence
+      3) chardet on head+tail if low confidence (skipped in single pass, --fast)
       4) chardet on larger read if allowed
       5) UTF-16 no-BOM heuristic, ASCII check, binary-like check
     Returns the encoding name as detected and confidence%.
     """
     try:
-        fsize = os.path.getsize(file_path)
+        fsize = os.path.getsize(file_path) if file_size is None else file_size
         if fsize == 0:
             return "unknown", 0.0
 
-        with open(file_path, 'rb') as f:
-            head = f.read(min(sample_size, fsize))
+        fd = _open_for_sampling(file_path)
+        try:
+            if fsize > sample_size:
+                _no_readahead(fd)
 
-            # 1) BOM detection
-            bom_enc = _detect_bom(head)
+            # 1) BOM detection from the first 4 bytes, before paying for the full sample
+            lead = _pread(fd, 4, 0)
+            bom_enc = _detect_bom(lead)
             if bom_enc:
                 return bom_enc, 100.0
 
+            head = lead + _pread(fd, max(0, min(sample_size, fsize) - len(lead)), len(lead))
+            head_stats = _classify_sample(head)
+
+            # Pure 7-bit text: chardet can only answer ascii here, so skip it
+            if _is_plain_ascii(head_stats):
+                return 'ascii', 100.0
+
+            # NUL-free bytes that strictly decode as UTF-8 are UTF-8 in practice; the C
+            # decoder settles that far faster than chardet's probers (NUL is excluded
+            # because BOM-less UTF-16 text is also "valid" UTF-8, ESC because 7-bit
+            # ISO-2022 text is too)
+            if (not head_stats['nul'] and not head_stats['esc']
+                    and _is_valid_utf8(head, partial=fsize > len(head))):
+                return 'utf-8', 99.0
+
+            # NUL-heavy sample that isn't UTF-16/32-shaped: chardet's probers would only
+            # churn on it, so settle it as binary up front
+            heuristic = _binary_verdict(head_stats)
+            if heuristic:
+                return heuristic
+
             # 2) Primary detection on head
-            head_res = chardet.detect(head)
+            head_res = _cached_detect(head)
             head_enc = head_res.get('encoding') or "unknown"
             head_conf = float(head_res.get('confidence') or 0.0)
 
@@ -218,62 +487,99 @@ def detect_encoding(file_path: Path,
             if fsize <= sample_size:
                 if head_enc != "unknown":
                     return head_enc, head_conf * 100.0
-                utf16_guess = _guess_utf16_no_bom(head)
-                if utf16_guess:
-                    return utf16_guess, 95.0
-                if _is_mostly_ascii(head):
-                    return 'ascii', 99.0
-                if _is_binary_like(head):
-                    return 'binary', 100.0
-                return "unknown", 0.0
-
-            # For bigger files:
-            if head_conf >= min_confidence_first_pass:
-                return head_enc, head_conf * 100.0
-
-            # 3) Head + tail
-            try:
-                f.seek(max(0, fsize - sample_size))
-                tail = f.read(sample_size)
-            except Exception:
-                tail = b''
-            combined = head + tail if tail else head
-
-            comb_res = chardet.detect(combined)
-            comb_enc = comb_res.get('encoding') or "unknown"
-            comb_conf = float(comb_res.get('confidence') or 0.0)
-            if comb_conf >= min_confidence_first_pass and comb_enc != "unknown":
-                return comb_enc, comb_conf * 100.0
+                return _apply_heuristics(head_stats) or ("unknown", 0.0)
+
+            # For bigger files: a confident named verdict settles it. chardet also answers
+            # "no encoding" with high confidence (e.g. BOM-less UTF-16), so let the
+            # UTF-16/ASCII/binary heuristics look at the head before moving on.
+            # A single pass (--fast) has nothing better to wait for, so like a small
+            # file it keeps the head's named verdict at whatever confidence it has.
+            if head_enc != "unknown":
+                if head_conf >= min_confidence_first_pass or not do_second_pass:
+                    return head_enc, head_conf * 100.0
+            else:
+                heuristic = _apply_heuristics(head_stats)
+                if heuristic:
+                    return heuristic
 
-            # 4) Larger second pass
             if do_second_pass:
-                f.seek(0)
-                big = f.read(min(fsize, sample_size * second_pass_factor))
-                bom_enc2 = _detect_bom(big)
-                if bom_enc2:
-                    return bom_enc2, 100.0
-
-                big_res = chardet.detect(big)
+                # 3) Head + tail; the tail starts after the head, so a file under two
+                # samples long contributes only its unread remainder (no bytes twice)
+                tail_start = max(len(head), fsize - sample_size)
+                try:
+                    tail = _pread(fd, fsize - tail_start, tail_start) if tail_start < fsize else b''
+                except OSError:
+                    tail = b''
+                combined = head + tail if tail else head
+
+                comb_res = _cached_detect(combined)
+                comb_enc = comb_res.get('encoding') or "unknown"
+                comb_conf = float(comb_res.get('confidence') or 0.0)
+                if comb_conf >= min_confidence_first_pass and comb_enc != "unknown":
+                    return comb_enc, comb_conf * 100.0
+
+                # 4) Larger second pass; the head is already in memory, so only fetch
+                # the bytes after it
+                big_size = min(fsize, sample_size * second_pass_factor)
+                big = head + _pread(fd, big_size - len(head), len(head))
+                big_stats = _classify_sample(big)
+                if big_stats['bom']:
+                    return big_stats['bom'], 100.0
+
+                heuristic = _binary_verdict(big_stats)
+                if heuristic:
+                    return heuristic
+
+                big_res = _cached_detect(big)
                 big_enc = big_res.get('encoding') or "unknown"
                 big_conf = float(big_res.get('confidence') or 0.0)
                 if big_enc != "unknown":
                     return big_enc, big_conf * 100.0
 
                 # 5) Heuristics on big sample
-                utf16_guess2 = _guess_utf16_no_bom(big)
-                if utf16_guess2:
-                    return utf16_guess2, 95.0
-                if _is_mostly_ascii(big):
-                    return 'ascii', 99.0
-                if _is_binary_like(big):
-                    return 'binary', 100.0
+                heuristic = _apply_heuristics(big_stats)
+                if heuristic:
+                    return heuristic
+            else:
+                # 5) Single pass (--fast) with no named verdict: the heuristics still
+                # get the head
+                heuristic = _apply_heuristics(head_stats)
+                if heuristic:
+                    return heuristic
 
             # Final fallback
             return "unknown", 0.0
+        finally:
+            os.close(fd)
 
     except Exception as e:
         return f"error: {str(e)}", 0.0
 
+def _make_backup(file_path: Path, backup_path: Path, link: bool = True) -> None:
+    """
+    Keep the original bytes at backup_path. The converted file is normally written
+    to a new inode and swapped in with os.replace, so a hardlink to the original is
+    a complete backup at no I/O cost; filesystems without hardlinks get a copy, and
+    so does a file that will be rewritten in place (link=False).
+    """
+    try:
+        os.unlink(backup_path)  # an older backup is overwritten, as copy2 did
+    except FileNotFoundError:
+        pass
+    # Link the real file: os.link on a symlink may link the symlink itself, and a
+    # backup that points at the file about to be converted preserves nothing
+    if link:
+        try:
+            os.link(os.path.realpath(file_path), backup_path)
+            return
+        except OSError:
+            pass
+    shutil.copy2(file_path, backup_path, follow_symlinks=True)
+
+
+# Characters decoded per read when re-encoding a file
+CONVERT_CHUNK_CHARS = 1 << 20
+
 def convert_file_encoding(file_path: Path,
                           target_encoding: str,
                           source_encoding: str,
@@ -291,18 +597,44 @@ def convert_file_encoding(file_path: Path,
         if source_encoding in ['unknown', 'binary'] or source_encoding.startswith('error'):
             return False, f"Cannot convert from {source_encoding}"
 
-        # Read with source encoding
-        with open(file_path, 'r', encoding=source_encoding, errors='strict') as f:
-            content = f.read()
+        # Convert the real file: swapping a new inode in at a symlink's path would
+        # replace the link and leave its target unconverted. A file with other
+        # hardlinks keeps its inode too, so it is rewritten in place instead.
+        real_path = os.path.realpath(file_path)
+        in_place = os.stat(real_path).st_nlink > 1
 
-        # Create backup if requested
-        if backup:
-            backup_path = file_path.with_suffix(file_path.suffix + '.bak')
-            shutil.copy2(file_path, backup_path)
-
-        # Write with target encoding
-        with open(file_path, 'w', encoding=target_encoding, errors='strict') as f:
-            f.write(content)
+        # Stream source -> temp file in the same folder in CONVERT_CHUNK_CHARS pieces,
+        # so peak memory stays flat and the original is untouched until it all succeeded
+        fd, tmp_name = tempfile.mkstemp(prefix=f'.{os.path.basename(real_path)}.', suffix='.tmp',
+                                        dir=os.path.dirname(real_path))
+        try:
+            with open(real_path, 'r', encoding=source_encoding, errors='strict') as src, \
+                    open(fd, 'w', encoding=target_encoding, errors='strict') as dst:
+                while True:
+                    chunk = src.read(CONVERT_CHUNK_CHARS)
+                    if not chunk:
+                        break
+                    dst.write(chunk)
+
+            # Create backup if requested
+            if backup:
+                _make_backup(file_path, file_path.with_suffix(file_path.suffix + '.bak'),
+                             link=not in_place)
+
+            if in_place:
+                with open(tmp_name, 'rb') as src, open(real_path, 'r+b') as dst:
+                    shutil.copyfileobj(src, dst)
+                    dst.truncate()
+                os.unlink(tmp_name)
+            else:
+                shutil.copymode(real_path, tmp_name)
+                os.replace(tmp_name, real_path)
+        except BaseException:
+            try:
+                os.unlink(tmp_name)
+            except OSError:
+                pass
+            raise
 
         return True, f"Converted from {source_encoding} to {target_encoding}"
 
@@ -336,17 +668,29 @@ def convert_folder_files(folder_result: Dict,
     }
 
     folder_name = folder_result['folder_name']
+    target_lower = target_encoding.lower()
 
     # Determine if we should show individual files
     show_individual = verbose or stats['total'] <= 10
 
+    # Real conversions run on a small thread pool so file reads/writes (which release
+    # the GIL) overlap; map hands results back in file order so the output stays stable
+    pool = None
+    outcomes = None
+    if not dry_run and folder_result['files']:
+        pool = ThreadPoolExecutor(max_workers=min(CONVERT_JOBS, len(folder_result['files'])))
+        outcomes = pool.map(
+            lambda fi: convert_file_encoding(fi['path'], target_encoding, fi['encoding'], backup),
+            folder_result['files']
+        )
+
     for i, file_info in enumerate(folder_result['files'], 1):
         file_path = file_info['path']
         source_encoding = file_info['encoding']
 
         if dry_run:
             # Simulation mode
-            if source_encoding.lower() == target_encoding.lower():
+            if file_info['encoding_lower'] == target_lower:
                 stats['already_target'] += 1
                 if show_individual and show_progress:
                     print(f"  {Colors.DIM}[SKIP]{Colors.NC} {file_path.name} - already {target_encoding}")
@@ -361,10 +705,8 @@ def convert_folder_files(folder_result: Dict,
                     print(f"  {Colors.GREEN}[WOULD CONVERT]{Colors.NC} {file_path.name}: "
                           f"{source_encoding} → {target_encoding}")
         else:
-            # Actual conversion
-            success, message = convert_file_encoding(
-                file_path, target_encoding, source_encoding, backup
-            )
+            # Actual conversion (already running on the pool)
+            success, message = next(outcomes)
 
             if success:
                 if message == "already_target":
@@ -385,6 +727,9 @@ def convert_folder_files(folder_result: Dict,
         if not show_individual and show_progress and i % 100 == 0:
             print(f"  {Colors.DIM}Processed {i}/{stats['total']} files...{Colors.NC}", end='\r')
 
+    if pool is not None:
+        pool.shutdown(wait=True)
+
     # Clear the progress line
     if not show_individual and show_progress and stats['total'] > 10:
         print(" " * 80, end='\r')
@@ -433,7 +778,7 @@ def display_conversion_summary(all_conversion_stats: List[Tuple[str, Dict]],
     if encoding_totals:
         action = "Would convert" if dry_run else "Converted"
         print(f"\n{Colors.BOLD}{action} by source encoding:{Colors.NC}")
-        for enc, count in sorted(encoding_totals.items(), key=lambda x: x[1], reverse=True):
+        for enc, count in sorted(encoding_totals.items(), key=itemgetter(1), reverse=True):
             print(f"  {Colors.GREEN}{enc}{Colors.NC}: {count} files")
 
     # Summary stats
@@ -474,7 +819,8 @@ def rollback_backups(folder_path: Path) -> Tuple[int, int]:
     restored = 0
     failed = 0
 
-    for backup_file in folder_path.rglob('*.csv.bak'):
+    for backup_name in _iter_csv(folder_path, suffix='.csv.bak'):
+        backup_file = Path(backup_name)
         original = backup_file.with_suffix('')  # Remove .bak
         try:
             shutil.move(str(backup_file), str(original))
@@ -489,7 +835,11 @@ def get_folder_display_name(folder_path: Path, delimiters: str = "_- ") -> str:
     Determine the display name from a folder name using the first delimiter found.
     If none of the delimiters appear, return the folder name unchanged.
     """
-    name = folder_path.name
+    return _display_name(folder_path.name, delimiters)
+
+@lru_cache(maxsize=None)
+def _display_name(name: str, delimiters: str) -> str:
+    """Cached core of get_folder_display_name, keyed on the hashable name string."""
     first_idx = None
     for ch in delimiters:
         idx = name.find(ch)
@@ -500,66 +850,283 @@ def get_folder_display_name(folder_path: Path, delimiters: str = "_- ") -> str:
     return name[first_idx + 1:]
 
 
+def _iter_csv(root: Path, recursive: bool = True, suffix: str = '.csv') -> Iterator[str]:
+    """
+    Yield CSV file paths (as str) under root, any case of the suffix (.csv by
+    default, .csv.bak for backups). Callers wrap a path in Path only once it
+    lands in a result.
+    """
+    return (entry.path for entry in _scan_csv(root, recursive, suffix))
+
+
+def _scan_csv(root: Path, recursive: bool = True, suffix: str = '.csv') -> Iterator[os.DirEntry]:
+    """
+    The DirEntry of every CSV file under root, from one os.scandir walk. DirEntry
+    carries the file type from the directory read, so no extra stat per entry;
+    symlinked folders are not followed.
+    """
+    stack = [root]
+    while stack:
+        current = stack.pop()
+        try:
+            with os.scandir(current) as it:
+                for entry in it:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            if recursive:
+                                stack.append(entry.path)
+                        elif entry.name.lower().endswith(suffix) and entry.is_file():
+                            yield entry
+                    except OSError:
+                        continue
+        except OSError:
+            continue
+
+
+def _folder_csv_files(subfolder: Path, bak_folder: str, csv_mode: str) -> List[os.DirEntry]:
+    """CSV files to analyze for one subfolder (see count_total_csv_files for the rules)."""
+    if csv_mode == 'any':
+        # One recursive walk; the direct files are the ones sitting in subfolder itself
+        found = list(_scan_csv(subfolder))
+        folder = os.fspath(subfolder)
+        return [e for e in found if os.path.dirname(e.path) == folder] or found
+    # Only folders with a populated bak folder qualify; direct files still take precedence
+    bak_path = subfolder / bak_folder
+    csv_files = list(_scan_csv(bak_path, recursive=False)) if bak_path.is_dir() else []
+    if csv_files:
+        csv_files = list(_scan_csv(subfolder, recursive=False)) or csv_files
+    return csv_files
+
+
+# Files stat'ed per thread-pool task: big enough to amortize the task, small
+# enough that one huge folder still spreads over the threads
+_STAT_BATCH = 256
+
+def _stat_entries(batch: List[os.DirEntry]) -> List[Tuple[str, int, int]]:
+    """(path, size, mtime_ns) per entry; size is -1 when the file can't be stat'ed."""
+    stats = []
+    for entry in batch:
+        try:
+            st = entry.stat()  # free on Windows (from the directory read), a stat elsewhere
+        except OSError:
+            stats.append((entry.path, -1, 0))
+        else:
+            stats.append((entry.path, st.st_size, st.st_mtime_ns))
+    return stats
+
+
 def count_total_csv_files(top_directory: Path,
                           pattern: Optional[str] = None,
                           bak_folder: str = 'bak',
-                          csv_mode: str = 'any') -> Tuple[int, List[Path]]:
+                          csv_mode: str = 'any') -> Tuple[int, Dict[Path, List[Tuple[str, int, int]]]]:
     """
-    Count total CSV files and get list of folders to process.
+    Count total CSV files and collect the files to process per folder in one scan.
     Now supports both structures:
     1. Classic: parent/subfolders/csv_files
     2. Direct: csv_folder/csv_files
 
+    A subfolder that holds CSV files directly is analyzed on those files only;
+    otherwise its files come from the recursive search or the bak folder.
+
+    Every file is stat'ed here, on the scan's thread pool, so the cache key and
+    the largest-first schedule need no further per-file syscalls.
+
     Returns:
-        Tuple of (total_file_count, list_of_folders_with_csv)
+        Tuple of (total_file_count, {folder: [(path, size, mtime_ns), ...]}) in
+        processing order; size is -1 for files that couldn't be stat'ed
     """
-    total_files = 0
-    folders_with_csv = []
+    folder_entries: Dict[Path, List[os.DirEntry]] = {}
 
     # Check if this directory contains CSV files directly
-    direct_csv_files = list(top_directory.glob('*.csv')) + list(top_directory.glob('*.CSV'))
+    direct_csv_files = list(_scan_csv(top_directory, recursive=False))
     
     if direct_csv_files:
         # Direct CSV folder structure - treat the directory itself as the target
-        total_files = len(direct_csv_files)
-        folders_with_csv = [top_directory]
-        return total_files, folders_with_csv
-
-    # Classic subfolder structure - get all immediate subdirectories
-    subfolders = [d for d in top_directory.iterdir() if d.is_dir()]
-
-    # Optional filter by pattern
-    if pattern:
-        if pattern == 'underscore':
-            subfolders = [d for d in subfolders if '_' in d.name]
-
-    # Count CSV files in each folder
-    for subfolder in sorted(subfolders):
-        if csv_mode == 'any':
-            csv_files = list(subfolder.rglob('*.csv')) + list(subfolder.rglob('*.CSV'))
-        else:
-            bak_path = subfolder / bak_folder
-            if bak_path.exists() and bak_path.is_dir():
-                csv_files = list(bak_path.glob('*.csv')) + list(bak_path.glob('*.CSV'))
-            else:
-                csv_files = []
-        if csv_files:
-            total_files += len(csv_files)
-            folders_with_csv.append(subfolder)
-
-    return total_files, folders_with_csv
+        folder_entries[top_directory] = direct_csv_files
+    else:
+        # Classic subfolder structure - get all immediate subdirectories (d_type from
+        # the directory read; only symlinks cost a stat)
+        with os.scandir(top_directory) as it:
+            subfolders = [Path(e.path) for e in it if e.is_dir()]
+
+        # Optional filter by pattern
+        if pattern:
+            if pattern == 'underscore':
+                subfolders = [d for d in subfolders if '_' in d.name]
+
+        subfolders.sort()
+        if not subfolders:
+            return 0, {}
+
+        # Directory reads are I/O-bound and release the GIL, so scan the subfolders
+        # concurrently; this hides per-readdir latency on network filesystems
+        with ThreadPoolExecutor(max_workers=min(32, len(subfolders))) as tp:
+            per_folder = list(tp.map(lambda d: _folder_csv_files(d, bak_folder, csv_mode), subfolders))
+
+        for subfolder, csv_files in zip(subfolders, per_folder):
+            if csv_files:
+                folder_entries[subfolder] = csv_files
+
+    if not folder_entries:
+        return 0, {}
+
+    # Stat the files the same way, in batches across all folders, so one big
+    # folder doesn't serialize its round-trips on a single thread
+    batches = [entries[i:i + _STAT_BATCH]
+               for entries in folder_entries.values()
+               for i in range(0, len(entries), _STAT_BATCH)]
+    with ThreadPoolExecutor(max_workers=min(32, len(batches))) as tp:
+        stat_batches = iter(tp.map(_stat_entries, batches))
+
+        folder_files: Dict[Path, List[Tuple[str, int, int]]] = {}
+        for folder, entries in folder_entries.items():
+            files = folder_files[folder] = []
+            for _ in range(0, len(entries), _STAT_BATCH):
+                files.extend(next(stat_batches))
+
+    return sum(map(len, folder_files.values())), folder_files
+
+
+def _init_worker(detector: str = 'auto'):
+    """
+    Pool initializer: bind the parent's detector (spawned workers re-import the
+    module) and run one throwaway detection so its lazily loaded models are
+    ready before the first real file, in every worker.
+    """
+    select_detector(detector)
+    try:
+        chardet.detect('Caf\u00e9;na\u00efve;\u00e5\u00e4\u00f6\n'.encode('latin-1'))
+    except Exception:
+        pass
 
 
 def _detect_one(args_tuple):
-    file_path, folder_path, folder_display_name, sample_size, do_second_pass = args_tuple
-    enc, conf = detect_encoding(
+    # Only the path string crosses the process boundary; the caller pairs results
+    # back up with their folder by position
+    file_path, file_size, sample_size, do_second_pass = args_tuple
+    return detect_encoding(
         file_path=file_path,
         sample_size=sample_size,
         do_second_pass=do_second_pass,
-        second_pass_factor=4,
-        min_confidence_first_pass=0.70
+        second_pass_factor=SECOND_PASS_FACTOR,
+        min_confidence_first_pass=0.70,
+        file_size=file_size
     )
-    return file_path, enc, conf, folder_path, folder_display_name
+
+
+# --- Persistent detection cache (skips unchanged files across runs) ---
+
+DETECTION_CACHE_VERSION = 2
+# Results are kept per settings combination (detector, sample size, second pass),
+# so alternating e.g. --fast and normal runs doesn't wipe either; the most
+# recently written combinations are kept
+DETECTION_CACHE_MAX_SETTINGS = 4
+# Entries kept across runs; the least recently detected files are dropped first,
+# so deleted or moved files don't make the index grow forever
+DETECTION_CACHE_MAX_ENTRIES = 200_000
+
+def detection_cache_path() -> Path:
+    """Location of the on-disk cache: $XDG_CACHE_HOME (or ~/.cache)/check_csv_charset/index.json"""
+    base = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    return Path(base) / 'check_csv_charset' / 'index.json'
+
+def load_detection_cache(sample_size: int, do_second_pass: bool) -> Dict:
+    """
+    Load the cache for the current detection settings. Results depend on the
+    detector and sampling settings, so each combination has its own section and
+    never answers with another one's verdicts; the other sections are carried
+    along untouched so saving keeps them.
+    """
+    settings = [chardet.__name__, getattr(chardet, '__version__', ''), sample_size, do_second_pass]
+    cache = {'version': DETECTION_CACHE_VERSION, 'settings': settings, 'files': {},
+             'other_sections': [], 'dirty': False}
+    try:
+        with open(detection_cache_path(), 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        if data.get('version') == DETECTION_CACHE_VERSION:
+            for section in data.get('sections') or []:
+                # A section that isn't the expected shape is dropped (a cache miss)
+                if not isinstance(section, dict) or not isinstance(section.get('files'), dict):
+                    continue
+                if section.get('settings') == settings:
+                    cache['files'] = _valid_cache_files(section['files'])
+                else:
+                    cache['other_sections'].append(section)
+    except (OSError, ValueError, AttributeError, TypeError):
+        pass
+    return cache
+
+def _valid_cache_files(files: Dict) -> Dict:
+    """Keep the entries shaped like _cache_store writes them: [mtime_ns, size, encoding, confidence]."""
+    return {
+        path: hit for path, hit in files.items()
+        if isinstance(hit, list) and len(hit) == 4
+        and type(hit[0]) is int and type(hit[1]) is int and isinstance(hit[2], str)
+        and isinstance(hit[3], (int, float)) and not isinstance(hit[3], bool)
+    }
+
+def save_detection_cache(cache: Dict) -> None:
+    """Write the cache atomically (temp file + os.replace); failures only cost the cache."""
+    if not cache.get('dirty'):
+        return
+    files = cache['files']
+    excess = len(files) - DETECTION_CACHE_MAX_ENTRIES
+    if excess > 0:
+        # Insertion order is detection order (see _cache_store)
+        for stale in list(itertools.islice(files, excess)):
+            del files[stale]
+    path = detection_cache_path()
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(prefix='.index.', suffix='.tmp', dir=path.parent)
+        try:
+            with open(fd, 'w', encoding='utf-8') as f:
+                # Sections are oldest-first; the one just used goes last
+                sections = cache['other_sections'][-(DETECTION_CACHE_MAX_SETTINGS - 1):]
+                sections.append({'settings': cache['settings'], 'files': files})
+                json.dump({'version': cache['version'], 'sections': sections},
+                          f, separators=(',', ':'))
+            os.replace(tmp_name, path)
+        except BaseException:
+            try:
+                os.unlink(tmp_name)
+            except OSError:
+                pass
+            raise
+        cache['dirty'] = False
+    except OSError:
+        pass
+
+def clear_detection_cache() -> bool:
+    """Delete the on-disk cache; returns True if there was one."""
+    try:
+        os.unlink(detection_cache_path())
+        return True
+    except FileNotFoundError:
+        return False
+
+def _cache_lookup(cache: Dict, path_str: str, size: int,
+                  mtime_ns: int) -> Tuple[Optional[list], Optional[Tuple[str, float]]]:
+    """
+    Return (key, cached result) for a file stat'ed by the scan; the key is None
+    when the file couldn't be stat'ed (size -1).
+    """
+    if size < 0:
+        return None, None
+    key = [os.path.abspath(path_str), mtime_ns, size]
+    hit = cache['files'].get(key[0])
+    if hit and hit[0] == key[1] and hit[1] == key[2]:
+        return key, (hit[2], hit[3])
+    return key, None
+
+def _cache_store(cache: Dict, key: Optional[list], encoding: str, confidence: float) -> None:
+    """Remember a fresh result; errors are not cached so they get retried next time."""
+    if key is None or str(encoding).startswith('error'):
+        return
+    files = cache['files']
+    files.pop(key[0], None)  # re-insert so the newest detections sit at the end
+    files[key[0]] = [key[1], key[2], encoding, confidence]
+    cache['dirty'] = True
 
 
 def analyze_all_subfolders(top_directory: Path,
@@ -569,56 +1136,57 @@ def analyze_all_subfolders(top_directory: Path,
                            show_progress: bool = True,
                            jobs: Optional[int] = None,
                            fast: bool = False,
-                           sample_size: int = 65536,
-                           name_delims: str = "_- ") -> List[Dict]:
+                           sample_size: int = DEFAULT_SAMPLE_SIZE,
+                           name_delims: str = "_- ",
+                           use_cache: bool = True) -> List[Dict]:
     """
     Analyze all subfolders in parallel with a progress bar.
+    Files whose size and mtime match the on-disk detection cache are not re-read.
     Gracefully handles Ctrl+C (KeyboardInterrupt).
     """
     all_results: List[Dict] = []
 
     print(f"{Colors.CYAN}Scanning folders...{Colors.NC}")
-    total_files, folders_with_csv = count_total_csv_files(top_directory, pattern, bak_folder, csv_mode)
+    total_files, folder_files = count_total_csv_files(top_directory, pattern, bak_folder, csv_mode)
 
     if total_files == 0:
         return all_results
 
-    print(f"{Colors.GREEN}Found {total_files} CSV files in {len(folders_with_csv)} folders{Colors.NC}\n")
+    print(f"{Colors.GREEN}Found {total_files} CSV files in {len(folder_files)} folders{Colors.NC}\n")
 
     # Prepare per-folder result skeletons and tasks
     folder_result_map: Dict[Path, Dict] = {}
-    tasks = []
+    entries = []    # (path, result dict, display name), scan order
+    outcomes = []   # (encoding, confidence) per entry; None until detected
+    pending = []    # (entry index, file size or -1 if unknown) for entries that need detection
+    cache = load_detection_cache(sample_size, not fast) if use_cache else None
+    cache_keys: Dict[int, Optional[list]] = {}
 
-    for subfolder in folders_with_csv:
+    for subfolder, csv_files in folder_files.items():
         display_name = get_folder_display_name(subfolder, name_delims)
         res = {
             'folder_path': subfolder,
             'folder_name': display_name,
             'files': [],
-            'encodings': defaultdict(int),
-            'total': 0,
+            'encodings': Counter(),
+            'total': len(csv_files),
             'detected': 0,
             'errors': 0
         }
         folder_result_map[subfolder] = res
-
-        # Check if this is a direct CSV folder (contains CSV files directly)
-        direct_csv_files = list(subfolder.glob('*.csv')) + list(subfolder.glob('*.CSV'))
-        
-        if direct_csv_files:
-            # Direct CSV folder - use files directly in this folder
-            csv_files = direct_csv_files
-        elif csv_mode == 'any':
-            # Classic subfolder structure - search recursively
-            csv_files = list(subfolder.rglob('*.csv')) + list(subfolder.rglob('*.CSV'))
-        else:
-            # Specific subfolder mode
-            bak_path = subfolder / bak_folder
-            csv_files = list(bak_path.glob('*.csv')) + list(bak_path.glob('*.CSV')) if bak_path.exists() else []
-
-        res['total'] = len(csv_files)
-        for f in csv_files:
-            tasks.append((f, subfolder, res['folder_name'], sample_size, not fast))
+        for f, f_size, f_mtime_ns in csv_files:
+            idx = len(entries)
+            entries.append((f, res, display_name))
+            cached = None
+            if cache is not None:
+                cache_key, cached = _cache_lookup(cache, f, f_size, f_mtime_ns)
+                cache_keys[idx] = cache_key
+            outcomes.append(cached)
+            if cached is None:
+                pending.append((idx, f_size))
+
+    if cache is not None and len(pending) < total_files:
+        print(f"{Colors.DIM}Reusing cached results for {total_files - len(pending)} unchanged files{Colors.NC}")
 
     progress_bar = ProgressBar(total_files, title="Processing CSV files") if show_progress else None
 
@@ -626,64 +1194,81 @@ def analyze_all_subfolders(top_directory: Path,
     # Decide worker count with hard-cap + info
     cpu = os.cpu_count() or 1
     requested = jobs if (jobs and jobs > 0) else DEFAULT_JOBS
-    # Cap to 2x CPU and also to number of files (no point in more workers than files)
-    capped = min(requested, cpu * 2, total_files)
+    # Cap to 2x physical cores (4x logical CPUs for I/O-bound threads) and also to
+    # number of files (no point in more workers than files)
+    ceiling = cpu * 4 if _DETECTOR_IS_C else PHYSICAL_CPUS * 2
+    capped = min(requested, ceiling, max(1, len(pending)))
 
-    if capped < requested:
+    if pending and capped < requested:
         print(
             f"{Colors.YELLOW}ℹ Limiting jobs from {requested} to {capped} "
-            f"(CPU={cpu}, files={total_files}) for stability{Colors.NC}"
+            f"(CPU={cpu}, cores={PHYSICAL_CPUS}, files={len(pending)}) for stability{Colors.NC}"
         )
 
     max_workers = max(1, capped)
 
-    ex: Optional[ProcessPoolExecutor] = None
-    futures = []
-    try:
-        ex = ProcessPoolExecutor(max_workers=max_workers)
-        futures = [ex.submit(_detect_one, t) for t in tasks]
-
-        for fut in as_completed(futures):
-            file_path, encoding, confidence, folder_path, folder_display_name = fut.result()
-            res = folder_result_map[folder_path]
-
-            res['files'].append({
-                'path': file_path,
-                'name': file_path.name,
-                'encoding': encoding,
-                'confidence': confidence
-            })
+    # Hand each worker a batch of files per round-trip so pickling/IPC is amortized
+    chunksize = max(1, len(pending) // (max_workers * 8))
+
+    # Largest files first (LPT), so one big CSV can't start last and run alone at
+    # the end. map() cuts tasks into contiguous chunks, so deal the size-sorted files
+    # round-robin into the chunks: every batch mixes large and small files, and
+    # batches still go out roughly largest-first.
+    pending.sort(key=itemgetter(1), reverse=True)
+    n_chunks = max(1, -(-len(pending) // chunksize))
+    order = [idx for start in range(n_chunks) for idx, _ in pending[start::n_chunks]]
+    # The scan's size goes along so workers don't stat again; an unknown (-1) size
+    # lets the worker stat and report the error itself
+    sizes = dict(pending)
+    tasks = [(entries[idx][0], sizes[idx] if sizes[idx] >= 0 else None, sample_size, not fast)
+             for idx in order]
+
+    def _record(idx: int) -> None:
+        """Progress line for one finished entry."""
+        nonlocal processed
+        processed += 1
+        if progress_bar:
+            path_str, _, folder_display_name = entries[idx]
+            progress_bar.update(processed, f"{folder_display_name}/{os.path.basename(path_str)}")
 
-            if encoding and not str(encoding).startswith('error') and encoding != "unknown":
-                res['detected'] += 1
-                res['encodings'][encoding] += 1
-            else:
-                res['errors'] += 1
+    executor_cls = ThreadPoolExecutor if _DETECTOR_IS_C else ProcessPoolExecutor
 
-            processed += 1
-            if progress_bar:
-                progress_bar.update(processed, f"{folder_display_name}/{file_path.name}")
+    ex = None
+    try:
+        for idx, outcome in enumerate(outcomes):
+            if outcome is not None:
+                _record(idx)
+
+        if tasks:
+            ex = executor_cls(max_workers=max_workers, initializer=_init_worker,
+                              initargs=(chardet.__name__,))
+            # map yields in submission order, so results line up with `order`
+            for idx, outcome in zip(order, ex.map(_detect_one, tasks, chunksize=chunksize)):
+                outcomes[idx] = outcome
+                if cache is not None:
+                    _cache_store(cache, cache_keys[idx], *outcome)
+                _record(idx)
+
+            # Normal completion: join the workers so interpreter exit has nothing left to wake up
+            ex.shutdown(wait=True)
+            ex = None
 
     except KeyboardInterrupt:
         # Graceful interrupt: cancel remaining work and return partial results
         if progress_bar:
             print()
         print(f"{Colors.YELLOW}↩ Ctrl+C detected. Shutting down gracefully...{Colors.NC}")
-        # Try to stop quickly
         try:
-            for fut in futures:
-                fut.cancel()
-        except Exception:
-            pass
-        try:
-            # Python 3.9+: cancel_futures available
-            ex.shutdown(wait=False, cancel_futures=True)  # type: ignore
+            # Python 3.9+: cancel_futures drops the batches not yet started
+            if ex is not None:
+                ex.shutdown(wait=False, cancel_futures=True)  # type: ignore
         except TypeError:
             # Older Python: best-effort
             ex.shutdown(wait=False)
         except Exception:
             pass
-        return [folder_result_map[f] for f in folders_with_csv if folder_result_map[f]['total'] > 0]
+        ex = None
+        return _collect_results(entries, outcomes, folder_result_map)
 
     finally:
         if ex is not None:
@@ -691,13 +1276,45 @@ def analyze_all_subfolders(top_directory: Path,
                 ex.shutdown(wait=False)
             except Exception:
                 pass
+        # Whatever got detected (also on Ctrl+C) is kept for the next run
+        if cache is not None:
+            save_detection_cache(cache)
 
     if progress_bar:
         progress_bar.finish()
     print()  # Extra line after progress bar (or scanning)
 
-    # Preserve original folder order
-    return [folder_result_map[f] for f in folders_with_csv if folder_result_map[f]['total'] > 0]
+    return _collect_results(entries, outcomes, folder_result_map)
+
+
+def _collect_results(entries: List[Tuple[str, Dict, str]],
+                     outcomes: List[Optional[Tuple[str, float]]],
+                     folder_result_map: Dict[Path, Dict]) -> List[Dict]:
+    """Fill the per-folder results in scan order, whatever order detection finished in."""
+    for (path_str, res, _), outcome in zip(entries, outcomes):
+        if outcome is None:
+            continue  # interrupted before this file was detected
+        encoding, confidence = outcome
+        # Labels come back from the workers as fresh strings (unpickled or from
+        # the cache); intern them so N files share a handful of key objects
+        encoding = sys.intern(encoding)
+        file_path = Path(path_str)
+        res['files'].append({
+            'path': file_path,
+            'name': file_path.name,
+            'encoding': encoding,
+            'encoding_lower': sys.intern(encoding.lower()),  # for case-insensitive filters/compares
+            'confidence': confidence
+        })
+
+        if encoding and not str(encoding).startswith('error') and encoding != "unknown":
+            res['detected'] += 1
+            res['encodings'][encoding] += 1
+        else:
+            res['errors'] += 1
+
+    # Insertion order is the scan order; every folder in the map has files
+    return list(folder_result_map.values())
 
 
 def display_encoding_distribution(results: Dict, show_details: bool = False):
@@ -712,22 +1329,13 @@ def display_encoding_distribution(results: Dict, show_details: bool = False):
     print(f"{Colors.BOLD}{Colors.CYAN}Encoding Distribution {folder_name}:{Colors.NC}")
 
     # Sort encodings by count
-    sorted_encodings = sorted(results['encodings'].items(), key=lambda x: x[1], reverse=True)
+    sorted_encodings = results['encodings'].most_common()
 
     for encoding, count in sorted_encodings:
         percentage = (count / total) * 100
 
         # Color based on encoding type
-        if encoding and encoding.lower() in ['utf-8', 'utf8', 'utf-8-sig']:
-            enc_color = Colors.GREEN
-        elif encoding and encoding.lower() in ['ascii']:
-            enc_color = Colors.BLUE
-        elif encoding and ('iso' in encoding.lower() or 'windows' in encoding.lower()):
-            enc_color = Colors.YELLOW
-        elif encoding and encoding.lower() in ['binary', 'utf-16-le', 'utf-16-be', 'utf-32-le', 'utf-32-be']:
-            enc_color = Colors.RED
-        else:
-            enc_color = Colors.MAGENTA
+        enc_color = encoding_color(encoding)
 
         print(f"  {enc_color}{encoding}{Colors.NC}: {count} files ({percentage:.1f}%)")
 
@@ -746,22 +1354,10 @@ def display_summary(all_results: List[Dict], elapsed_time: float, interactive: b
     total_detected = sum(r['detected'] for r in all_results)
     total_errors = sum(r['errors'] for r in all_results)
 
-    # Aggregate all encodings and build file mapping
-    all_encodings = defaultdict(int)
-    encoding_to_files = defaultdict(list)
-    
+    # Aggregate all encodings (every file, errors included); Counter.update tallies in C
+    all_encodings = Counter()
     for results in all_results:
-        for file_info in results['files']:
-            encoding = file_info['encoding']
-            file_path = file_info['path']
-            confidence = file_info['confidence']
-            
-            all_encodings[encoding] += 1
-            encoding_to_files[encoding].append({
-                'path': str(file_path),  # Convert Path object to string
-                'confidence': confidence,
-                'folder': results['folder_name']
-            })
+        all_encodings.update(map(itemgetter('encoding'), results['files']))
 
     print(f"\n{Colors.BLUE}{'═' * 50}{Colors.NC}")
     print(f"{Colors.BOLD}{Colors.CYAN}OVERALL SUMMARY{Colors.NC}")
@@ -781,33 +1377,48 @@ def display_summary(all_results: List[Dict], elapsed_time: float, interactive: b
 
     if all_encodings:
         print(f"\n{Colors.BOLD}{Colors.CYAN}Overall Encoding Distribution:{Colors.NC}")
-        sorted_encodings = sorted(all_encodings.items(), key=lambda x: x[1], reverse=True)
+        sorted_encodings = all_encodings.most_common()
         encoding_numbers = {}  # Map numbers to encodings for easy selection
         
         for i, (encoding, count) in enumerate(sorted_encodings, 1):
             percentage = (count / total_detected) * 100 if total_detected > 0 else 0
-            if encoding and encoding.lower() in ['utf-8', 'utf8', 'utf-8-sig']:
-                enc_color = Colors.GREEN
-            elif encoding and encoding.lower() in ['ascii']:
-                enc_color = Colors.BLUE
-            elif encoding and ('iso' in encoding.lower() or 'windows' in encoding.lower()):
-                enc_color = Colors.YELLOW
-            elif encoding and encoding.lower() in ['binary', 'utf-16-le', 'utf-16-be', 'utf-32-le', 'utf-32-be']:
-                enc_color = Colors.RED
-            else:
-                enc_color = Colors.MAGENTA
+            enc_color = encoding_color(encoding)
             
             encoding_numbers[i] = encoding
             print(f"  [{Colors.BOLD}{i}{Colors.NC}] {enc_color}{encoding}{Colors.NC}: {count} files ({percentage:.1f}%)")
         
         # Add interactive file listing functionality
         if interactive:
-            return offer_encoding_exploration(encoding_numbers, encoding_to_files)
+            return offer_encoding_exploration(encoding_numbers, group_files_by_encoding(all_results))
     
     return True
 
 
-def offer_encoding_exploration(encoding_numbers: Dict[int, str], encoding_to_files: Dict[str, List[Dict]]):
+def group_files_by_encoding(all_results: List[Dict]) -> Dict[str, Dict[str, List[Dict]]]:
+    """
+    Map encoding -> folder name -> file records, folders in name order and files
+    in path order. Built once, so browsing the explorer repeatedly never re-sorts.
+    """
+    grouped: Dict[str, Dict[str, List[Dict]]] = defaultdict(lambda: defaultdict(list))
+    for results in all_results:
+        folder_name = results['folder_name']
+        for file_info in results['files']:
+            grouped[file_info['encoding']][folder_name].append({
+                'path': str(file_info['path']),  # Convert Path object to string
+                'confidence': file_info['confidence'],
+                'folder': folder_name
+            })
+
+    encoding_to_files = {}
+    for encoding, by_folder in grouped.items():
+        for folder_files in by_folder.values():
+            folder_files.sort(key=itemgetter('path'))
+        encoding_to_files[encoding] = {name: by_folder[name] for name in sorted(by_folder)}
+    return encoding_to_files
+
+
+def offer_encoding_exploration(encoding_numbers: Dict[int, str],
+                               encoding_to_files: Dict[str, Dict[str, List[Dict]]]):
     """Interactive exploration of files by encoding"""
     try:
         print(f"\n{Colors.CYAN}💡 Interactive File Explorer:{Colors.NC}")
@@ -827,15 +1438,16 @@ def offer_encoding_exploration(encoding_numbers: Dict[int, str], encoding_to_fil
                     display_all_files_by_encoding(encoding_to_files)
                     continue
                 
-                try:
-                    choice = int(user_input)
-                    if choice in encoding_numbers:
-                        encoding = encoding_numbers[choice]
-                        display_files_for_encoding(encoding, encoding_to_files[encoding])
-                    else:
-                        print(f"{Colors.RED}❌ Invalid choice. Please enter a number between 1 and {len(encoding_numbers)}{Colors.NC}")
-                except ValueError:
+                if not user_input.isdecimal():
                     print(f"{Colors.RED}❌ Invalid input. Please enter a number, 'all', or 'q'{Colors.NC}")
+                    continue
+
+                choice = int(user_input)
+                if choice in encoding_numbers:
+                    encoding = encoding_numbers[choice]
+                    display_files_for_encoding(encoding, encoding_to_files[encoding])
+                else:
+                    print(f"{Colors.RED}❌ Invalid choice. Please enter a number between 1 and {len(encoding_numbers)}{Colors.NC}")
                     
             except (EOFError, KeyboardInterrupt):
                 print(f"\n{Colors.GREEN}👋 Goodbye!{Colors.NC}")
@@ -847,66 +1459,60 @@ def offer_encoding_exploration(encoding_numbers: Dict[int, str], encoding_to_fil
     return True
 
 
-def display_files_for_encoding(encoding: str, files: List[Dict]):
-    """Display all files that have a specific encoding"""
-    if not files:
+def display_files_for_encoding(encoding: str, files_by_folder: Dict[str, List[Dict]]):
+    """Display all files that have a specific encoding (as grouped by group_files_by_encoding)"""
+    if not files_by_folder:
         print(f"{Colors.YELLOW}No files found for encoding: {encoding}{Colors.NC}")
         return
     
     # Color encoding name
-    if encoding and encoding.lower() in ['utf-8', 'utf8', 'utf-8-sig']:
-        enc_color = Colors.GREEN
-    elif encoding and encoding.lower() in ['ascii']:
-        enc_color = Colors.BLUE
-    elif encoding and ('iso' in encoding.lower() or 'windows' in encoding.lower()):
-        enc_color = Colors.YELLOW
-    elif encoding and encoding.lower() in ['binary', 'utf-16-le', 'utf-16-be', 'utf-32-le', 'utf-32-be']:
-        enc_color = Colors.RED
-    else:
-        enc_color = Colors.MAGENTA
-    
-    print(f"\n{Colors.BLUE}{'─' * 60}{Colors.NC}")
-    print(f"{Colors.BOLD}📋 Files with encoding: {enc_color}{encoding}{Colors.NC}")
-    print(f"{Colors.BLUE}{'─' * 60}{Colors.NC}")
-    
-    # Group by folder for better organization
-    files_by_folder = defaultdict(list)
-    for file_info in files:
-        files_by_folder[file_info['folder']].append(file_info)
+    enc_color = encoding_color(encoding)
+
+    # Collect the listing and write it once: thousands of files would otherwise
+    # mean several print() calls (and console writes) per file
+    lines = [
+        f"\n{Colors.BLUE}{'─' * 60}{Colors.NC}",
+        f"{Colors.BOLD}📋 Files with encoding: {enc_color}{encoding}{Colors.NC}",
+        f"{Colors.BLUE}{'─' * 60}{Colors.NC}",
+    ]
     
-    for folder_name in sorted(files_by_folder.keys()):
-        folder_files = files_by_folder[folder_name]
+    # Grouped by folder for better organization
+    for folder_name, folder_files in files_by_folder.items():
         if len(files_by_folder) > 1:  # Only show folder name if multiple folders
-            print(f"\n{Colors.CYAN}📁 Folder: {folder_name}{Colors.NC}")
+            lines.append(f"\n{Colors.CYAN}📁 Folder: {folder_name}{Colors.NC}")
         
-        for file_info in sorted(folder_files, key=lambda x: x['path']):
+        for file_info in folder_files:
             confidence = file_info['confidence']
             confidence_color = Colors.GREEN if confidence > 0.8 else Colors.YELLOW if confidence > 0.5 else Colors.RED
             
             # Extract just the filename for cleaner display
-            file_path = Path(file_info['path'])
-            filename = file_path.name
+            filename = os.path.basename(file_info['path'])
             
-            print(f"  📄 {Colors.BOLD}{filename}{Colors.NC}")
-            print(f"     {Colors.BLUE}Path:{Colors.NC} {file_info['path']}")
-            print(f"     {Colors.BLUE}Confidence:{Colors.NC} {confidence_color}{confidence:.2f}{Colors.NC}")
+            lines.append(f"  📄 {Colors.BOLD}{filename}{Colors.NC}")
+            lines.append(f"     {Colors.BLUE}Path:{Colors.NC} {file_info['path']}")
+            lines.append(f"     {Colors.BLUE}Confidence:{Colors.NC} {confidence_color}{confidence:.2f}{Colors.NC}")
 
+    lines.append('')
+    sys.stdout.write('\n'.join(lines))
+    sys.stdout.flush()
 
-def display_all_files_by_encoding(encoding_to_files: Dict[str, List[Dict]]):
+
+def display_all_files_by_encoding(encoding_to_files: Dict[str, Dict[str, List[Dict]]]):
     """Display all files grouped by encoding"""
     print(f"\n{Colors.BLUE}{'═' * 70}{Colors.NC}")
     print(f"{Colors.BOLD}{Colors.CYAN}📋 ALL FILES BY ENCODING{Colors.NC}")
     print(f"{Colors.BLUE}{'═' * 70}{Colors.NC}")
     
     # Sort encodings by file count (most common first)
-    sorted_encodings = sorted(encoding_to_files.items(), key=lambda x: len(x[1]), reverse=True)
+    sorted_encodings = sorted(encoding_to_files.items(),
+                              key=lambda x: sum(map(len, x[1].values())), reverse=True)
     
-    for encoding, files in sorted_encodings:
-        display_files_for_encoding(encoding, files)
+    for encoding, files_by_folder in sorted_encodings:
+        display_files_for_encoding(encoding, files_by_folder)
 
 
-def main():
-    start_time = time.time()
+def main(argv: Optional[List[str]] = None):
+    start_time = time.monotonic()
     parser = argparse.ArgumentParser(
         description='Detect character encoding of CSV files in structured folders with progress tracking (offline)',
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -958,6 +1564,12 @@ Examples:
         help='Show only the overall summary'
     )
 
+    parser.add_argument(
+        '--no-color',
+        action='store_true',
+        help='Plain output without ANSI colors (default when stdout is not a terminal or NO_COLOR is set)'
+    )
+
     parser.add_argument(
         '--pattern',
         choices=['underscore', 'all'],
@@ -975,20 +1587,40 @@ Examples:
         '-j', '--jobs',
         type=int,
         default=DEFAULT_JOBS,
-        help=f'Number of parallel workers (default: half cores = {DEFAULT_JOBS})'
+        help=f'Number of parallel workers (default: physical cores, max 8 = {DEFAULT_JOBS})'
     )
 
     parser.add_argument(
         '--fast',
         action='store_true',
-        help='Faster single-pass detection (lower I/O, slightly lower confidence)'
+        help=f'Faster single-pass detection on a {FAST_SAMPLE_SIZE}-byte sample unless --sample-size is given '
+             f'(lower I/O, slightly lower confidence)'
+    )
+
+    parser.add_argument(
+        '--detector',
+        choices=['auto', 'chardet', 'cchardet', 'charset_normalizer'],
+        default='auto',
+        help='Encoding detector to use (default: auto = cchardet, else chardet, else charset_normalizer)'
     )
 
     parser.add_argument(
         '--sample-size',
         type=int,
-        default=65536,
-        help='Bytes to sample per pass (default: 65536)'
+        help=f'Bytes to sample on the first pass; the second pass reads {SECOND_PASS_FACTOR}x this '
+             f'(default: {DEFAULT_SAMPLE_SIZE}, or {FAST_SAMPLE_SIZE} with --fast)'
+    )
+
+    parser.add_argument(
+        '--no-cache',
+        action='store_true',
+        help='Re-detect every file instead of reusing results for unchanged files'
+    )
+
+    parser.add_argument(
+        '--clear-cache',
+        action='store_true',
+        help='Delete the detection cache before analyzing'
     )
 
     parser.add_argument(
@@ -1036,7 +1668,10 @@ Examples:
         help='Enable interactive file explorer to browse files by encoding'
     )
 
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
+
+    if args.no_color or os.environ.get('NO_COLOR') or not sys.stdout.isatty():
+        disable_colors()
 
     # Validate directory
     directory = Path(args.directory)
@@ -1056,8 +1691,18 @@ Examples:
             print(f"{Colors.RED}Failed: {failed} files{Colors.NC}")
         sys.exit(0)
 
+    try:
+        select_detector(args.detector)
+    except ImportError:
+        print(f"{Colors.RED}Error: detector '{args.detector}' is not installed "
+              f"(pip3 install {args.detector}){Colors.NC}")
+        sys.exit(1)
+
+    if args.clear_cache and clear_detection_cache():
+        print(f"{Colors.DIM}Detection cache cleared{Colors.NC}")
+
     # Detect structure type
-    direct_csv_files = list(directory.glob('*.csv')) + list(directory.glob('*.CSV'))
+    direct_csv_files = list(_iter_csv(directory, recursive=False))
     structure_type = "direct" if direct_csv_files else "subfolder"
     
     # Perform analysis
@@ -1085,8 +1730,9 @@ Examples:
             show_progress=not args.no_progress,
             jobs=args.jobs,
             fast=args.fast,
-            sample_size=args.sample_size,
-            name_delims=args.name_delims
+            sample_size=args.sample_size or (FAST_SAMPLE_SIZE if args.fast else DEFAULT_SAMPLE_SIZE),
+            name_delims=args.name_delims,
+            use_cache=not args.no_cache
         )
     except KeyboardInterrupt:
         # Extra safety (should already be handled inside), but ensure a friendly exit
@@ -1107,7 +1753,7 @@ Examples:
             print()  # Empty line between folders
 
     # Display summary
-    elapsed_time = time.time() - start_time
+    elapsed_time = time.monotonic() - start_time
     display_summary(all_results, elapsed_time, args.interactive)
 
     # Perform conversion if requested
@@ -1130,14 +1776,14 @@ Examples:
         print(f"{Colors.BLUE}{'─' * 60}{Colors.NC}\n")
 
         conversion_stats = []
+        convert_filter = args.convert_filter.lower() if args.convert_filter else None
 
         for results in all_results:
             # Filter files if requested
-            if args.convert_filter:
+            if convert_filter:
                 filtered_results = results.copy()
                 filtered_results['files'] = [
-                    f for f in results['files']
-                    if f['encoding'].lower() == args.convert_filter.lower()
+                    f for f in results['files'] if f['encoding_lower'] == convert_filter
                 ]
                 if not filtered_results['files']:
                     continue
@@ -0,0 +1,132 @@
+import json
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import check_csv_charset as ccc
+
+SAMPLE = 'name,city\nJosé,Zürich\nRenée,Besançon\n'
+
+
+class ConvertFileEncodingTest(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.dir = Path(self._tmp.name)
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    @unittest.skipUnless(hasattr(os, 'symlink'), 'needs symlinks')
+    def test_converts_symlink_target(self):
+        target = self.dir / 'real.csv'
+        target.write_bytes(SAMPLE.encode('cp1252'))
+        link = self.dir / 'link.csv'
+        os.symlink(target, link)
+
+        ok, _ = ccc.convert_file_encoding(link, 'utf-8', 'cp1252', backup=False)
+
+        self.assertTrue(ok)
+        self.assertTrue(link.is_symlink())
+        self.assertEqual(target.read_bytes(), SAMPLE.encode('utf-8'))
+
+    @unittest.skipUnless(hasattr(os, 'symlink'), 'needs symlinks')
+    def test_backup_of_symlink_keeps_original_bytes(self):
+        target = self.dir / 'real.csv'
+        target.write_bytes(SAMPLE.encode('cp1252'))
+        link = self.dir / 'link.csv'
+        os.symlink(target, link)
+
+        ok, _ = ccc.convert_file_encoding(link, 'utf-8', 'cp1252')
+
+        self.assertTrue(ok)
+        backup = self.dir / 'link.csv.bak'
+        self.assertFalse(backup.is_symlink())
+        self.assertEqual(backup.read_bytes(), SAMPLE.encode('cp1252'))
+
+    def test_keeps_hardlinks_together(self):
+        original = self.dir / 'a.csv'
+        original.write_bytes(SAMPLE.encode('cp1252'))
+        other = self.dir / 'b.csv'
+        os.link(original, other)
+
+        ok, _ = ccc.convert_file_encoding(original, 'utf-8', 'cp1252')
+
+        self.assertTrue(ok)
+        self.assertEqual(other.read_bytes(), SAMPLE.encode('utf-8'))
+        self.assertEqual(Path(str(original) + '.bak').read_bytes(), SAMPLE.encode('cp1252'))
+
+
+class DetectEncodingTest(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.dir = Path(self._tmp.name)
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def test_single_pass_keeps_low_confidence_multibyte_verdict(self):
+        # Larger than the --fast head but under 64 KiB: chardet names the
+        # encoding with low confidence, and single-pass mode must not drop it
+        words = ['東京都', '大阪府', '株式会社', '売上高', '営業利益', 'データ', '顧客名', '住所']
+        rows = [f'{i},{words[i % 8]},{words[(i * 3) % 8]},{words[(i * 5) % 8]},{i * 37}'
+                for i in range(400)]
+        data = '\n'.join(rows).encode('cp932')
+        self.assertTrue(ccc.FAST_SAMPLE_SIZE < len(data) < 65536)
+        path = self.dir / 'sjis.csv'
+        path.write_bytes(data)
+
+        enc, conf = ccc.detect_encoding(path, ccc.FAST_SAMPLE_SIZE, do_second_pass=False)
+
+        self.assertNotEqual(enc, 'unknown')
+        self.assertGreater(conf, 0.0)
+        self.assertEqual(data.decode(enc), '\n'.join(rows))
+
+
+class DetectionCacheTest(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        patcher = mock.patch.dict(os.environ, {'XDG_CACHE_HOME': self._tmp.name})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def _write(self, sections):
+        path = ccc.detection_cache_path()
+        path.parent.mkdir(parents=True)
+        path.write_text(json.dumps({'version': ccc.DETECTION_CACHE_VERSION, 'sections': sections}))
+
+    def test_malformed_entries_are_misses(self):
+        settings = ccc.load_detection_cache(4096, True)['settings']
+        self._write([
+            {'settings': settings, 'files': {
+                '/a.csv': [1, 2],
+                '/b.csv': 'x',
+                '/c.csv': [1, 2, None, 3.0],
+                '/d.csv': [1, 2, 'utf-8', 99.0],
+            }},
+            {'settings': ['other'], 'files': [1, 2]},
+            5,
+        ])
+
+        cache = ccc.load_detection_cache(4096, True)
+
+        self.assertEqual(cache['files'], {'/d.csv': [1, 2, 'utf-8', 99.0]})
+        self.assertEqual(cache['other_sections'], [])
+        self.assertEqual(ccc._cache_lookup(cache, '/a.csv', 2, 1), (['/a.csv', 1, 2], None))
+
+    def test_malformed_current_section_is_a_miss(self):
+        settings = ccc.load_detection_cache(4096, True)['settings']
+        self._write([{'settings': settings, 'files': ['not', 'a', 'dict']}])
+
+        self.assertEqual(ccc.load_detection_cache(4096, True)['files'], {})
+
+
+if __name__ == '__main__':
+    unittest.main()